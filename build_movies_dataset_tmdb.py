@@ -4,25 +4,13 @@ Build a 480-movie dataset (4 genres × 120) from TMDb with constraints:
 - Each movie must exist on TMDb (obviously) and have an available trailer/teaser video
 - Exclude adult/erotic content
 - Exclude "famous" movies (configurable via popularity & vote_count thresholds)
-- Export to Excel, CSV and JSON with useful columns for your thesis
+- Write a Parquet dataset with useful columns for your thesis; derive Excel, CSV
+  and JSON with `python -m dataset_tools export`
 """
 
-import os
-import time
-import random
-import requests
-import pandas as pd
-from dotenv import load_dotenv
+from pathlib import Path
 
-load_dotenv()
-
-TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-if not TMDB_API_KEY:
-    raise RuntimeError("Please set TMDB_API_KEY in a .env file or environment variable.")
-
-API_BASE = "https://api.themoviedb.org/3"
-SESSION = requests.Session()
-SESSION.params = {"api_key": TMDB_API_KEY}
+from dataset_tools.tmdb import TMDbClient
 
 GENRES = {
     "Action": 28,
@@ -39,21 +27,12 @@ YEAR_MIN = 1990
 YEAR_MAX = 2024
 EXCLUDE_KEYWORDS = {"erotic", "porn", "hentai", "xxx", "adult film", "sexploitation"}
 
-def sleep():
-    time.sleep(0.3)
-
-def get_json(path, params=None):
-    sleep()
-    r = SESSION.get(f"{API_BASE}{path}", params=params or {}, timeout=30)
-    r.raise_for_status()
-    return r.json()
-
 def has_erotic_content(title, overview):
     text = (title + " " + overview).lower()
     return any(k in text for k in EXCLUDE_KEYWORDS)
 
-def get_videos(mid):
-    return get_json(f"/movie/{mid}/videos", {"language": "en-US"}).get("results", [])
+def get_videos(client, mid):
+    return client.get_json(f"/movie/{mid}/videos", {"language": "en-US"}).get("results", [])
 
 def pick_trailer(videos):
     for v in videos:
@@ -61,7 +40,7 @@ def pick_trailer(videos):
             return f"https://www.youtube.com/watch?v={v['key']}"
     return None
 
-def discover(genre_id, page):
+def discover(client, genre_id, page):
     params = {
         "with_genres": genre_id,
         "include_adult": "false",
@@ -71,29 +50,29 @@ def discover(genre_id, page):
         "primary_release_date.gte": f"{YEAR_MIN}-01-01",
         "primary_release_date.lte": f"{YEAR_MAX}-12-31",
     }
-    return get_json("/discover/movie", params).get("results", [])
+    return client.get_json("/discover/movie", params).get("results", [])
 
-def build_dataset():
+def build_dataset(client):
     rows = []
     for gname, gid in GENRES.items():
         print(f"Collecting {gname}...")
         page = 1
         collected = 0
         while collected < TARGET_PER_GENRE and page <= 500:
-            for m in discover(gid, page):
+            for m in discover(client, gid, page):
                 if has_erotic_content(m.get("title",""), m.get("overview","")):
                     continue
                 pop = float(m.get("popularity",0))
                 vc = int(m.get("vote_count",0))
                 if pop > MAX_POPULARITY or vc < MIN_VOTE_COUNT or vc > MAX_VOTE_COUNT:
                     continue
-                vids = get_videos(m["id"])
+                vids = get_videos(client, m["id"])
                 trailer = pick_trailer(vids)
                 if not trailer:
                     continue
                 rows.append({
                     "title": m["title"],
-                    "year": m.get("release_date","")[:4],
+                    "year": int(m["release_date"][:4]) if m.get("release_date") else None,
                     "genre": gname,
                     "tmdb_url": f"https://www.themoviedb.org/movie/{m['id']}",
                     "youtube_trailer_url": trailer,
@@ -106,11 +85,12 @@ def build_dataset():
                     break
             print(f"  page {page} → {collected} movies")
             page += 1
-    return pd.DataFrame(rows)
+    return rows
 
 if __name__ == "__main__":
-    df = build_dataset()
-    df.to_excel("movies_dataset_480.xlsx", index=False)
-    df.to_csv("movies_dataset_480.csv", index=False)
-    df.to_json("movies_dataset_480.json", orient="records", indent=2)
-    print("✅ Saved movies_dataset_480.xlsx, .csv and .json")
+    from dataset_tools.export import write_dataset
+
+    rows = build_dataset(TMDbClient())
+    write_dataset(rows, Path("movies_dataset_480.parquet"))
+    print("✅ Saved movies_dataset_480.parquet "
+          "(export with: python -m dataset_tools export movies_dataset_480.parquet --format xlsx csv json)")
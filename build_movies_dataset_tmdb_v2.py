@@ -5,29 +5,25 @@ Build a 480-movie dataset (4 genres × 120) from TMDb with practical constraints
 - Excludes erotic content (keyword screen)
 - Avoids very famous movies using adjustable popularity/vote_count caps
 - Robust: popularity.desc, no language lock for videos, adaptive filter relaxation
-- Exports Excel, CSV, JSON
+- Writes a Parquet dataset; Excel, CSV and JSON are derived with `python -m dataset_tools export`
 
 Usage:
-  1) pip install requests pandas openpyxl python-dotenv
+  1) pip install requests pyarrow python-dotenv
   2) Put TMDB_API_KEY=YOUR_KEY in .env (project root)
   3) python build_movies_dataset_tmdb_v2.py
 """
 
-import os
-import time
-import math
 import random
-import requests
-import pandas as pd
+from collections import Counter
+from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
-from dotenv import load_dotenv
 
-# ----------------------- Config -----------------------
-load_dotenv()
-TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-if not TMDB_API_KEY:
-    raise RuntimeError("Please set TMDB_API_KEY in .env or environment variables.")
+import requests
 
+from dataset_tools.prefetch import PagePrefetcher
+from dataset_tools.tmdb import TMDbClient, pick_trailer_url
+
+# ----------------------- Config -----------------------
 # Targets
 GENRES = {"Action": 28, "Comedy": 35, "Drama": 18, "Thriller": 53}
 TARGET_PER_GENRE = 120           # set 20 for a quick dry-run, then set back to 120
@@ -47,7 +43,7 @@ EXCLUDE_KEYWORDS = {
     "sexploitation", "xxx", "adult film", "adult movie", "explicit sex", "hentai"
 }
 
-# Request pacing and retries
+# Request pacing (retries and pooling come from the shared client)
 REQUESTS_PER_SEC = 4.0
 BASE_SLEEP = 1.0 / REQUESTS_PER_SEC
 MAX_PAGES = 500
@@ -56,28 +52,7 @@ random.seed(SEED)
 
 # ------------------------------------------------------
 
-API_BASE = "https://api.themoviedb.org/3"
-SESSION = requests.Session()
-SESSION.params = {"api_key": TMDB_API_KEY}
-SESSION.headers.update({"Accept": "application/json"})
-
-def _sleep(mult: float = 1.0):
-    time.sleep(BASE_SLEEP * mult)
-
-def request_json(path: str, params: Dict[str, Any] = None, attempts: int = 3) -> Dict[str, Any]:
-    params = params or {}
-    for i in range(attempts):
-        try:
-            _sleep(1.0 + 0.15 * i)  # gentle backoff
-            r = SESSION.get(f"{API_BASE}{path}", params=params, timeout=30)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            if i == attempts - 1:
-                raise
-    return {}
-
-def discover_page(genre_id: int, page: int) -> List[Dict[str, Any]]:
+def discover_page(client: TMDbClient, genre_id: int, page: int) -> List[Dict[str, Any]]:
     # popularity.desc to find items that likely have videos; we still cap "fame"
     params = {
         "with_genres": genre_id,
@@ -88,27 +63,14 @@ def discover_page(genre_id: int, page: int) -> List[Dict[str, Any]]:
         "primary_release_date.lte": f"{YEAR_MAX}-12-31",
         # don't filter by vote_count here; we apply our own logic later
     }
-    data = request_json("/discover/movie", params)
+    data = client.get_json("/discover/movie", params)
     return data.get("results", [])
 
-def fetch_videos(movie_id: int) -> List[Dict[str, Any]]:
+def fetch_videos(client: TMDbClient, movie_id: int) -> List[Dict[str, Any]]:
     # no language param -> accept any language; many entries register trailers non-en
-    data = request_json(f"/movie/{movie_id}/videos")
+    data = client.get_json(f"/movie/{movie_id}/videos")
     return data.get("results", [])
 
-def pick_trailer_url(videos: List[Dict[str, Any]]) -> Optional[str]:
-    # Prefer Trailer over Teaser; prefer official; YouTube only
-    candidates = [v for v in videos if v.get("site") == "YouTube" and v.get("key")]
-    if not candidates:
-        return None
-    def score(v):
-        t = (v.get("type") or "").lower()
-        typ = 2 if t == "trailer" else (1 if t == "teaser" else 0)
-        official = 1 if v.get("official") else 0
-        return (typ, official)
-    best = sorted(candidates, key=score, reverse=True)[0]
-    return f"https://www.youtube.com/watch?v={best['key']}"
-
 def is_erotic(title: str, overview: str) -> bool:
     text = f"{title or ''} {overview or ''}".lower()
     return any(k in text for k in EXCLUDE_KEYWORDS)
@@ -142,90 +104,98 @@ def adaptive_caps(page: int, start_caps: Tuple[float, int, int]) -> Tuple[float,
     max_votes = max_votes  # unchanged
     return (max_pop, min_votes, max_votes)
 
-def collect_for_genre(genre_name: str, genre_id: int, target: int) -> List[Dict[str, Any]]:
+def collect_for_genre(client: TMDbClient, genre_name: str, genre_id: int, target: int) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     seen_ids = set()
 
     start_caps = (MAX_POPULARITY, MIN_VOTE_COUNT, MAX_VOTE_COUNT)
-    page = 1
-
-    while len(rows) < target and page <= MAX_PAGES:
-        caps_now = adaptive_caps(page, start_caps)
-        items = discover_page(genre_id, page)
-        # light shuffle to avoid clumping
-        random.shuffle(items)
-
-        for m in items:
-            mid = m.get("id")
-            if not mid or mid in seen_ids:
-                continue
-
-            title = m.get("title") or m.get("name") or ""
-            overview = m.get("overview") or ""
-            if is_erotic(title, overview):
-                continue
-
-            pop = float(m.get("popularity") or 0.0)
-            vc = int(m.get("vote_count") or 0)
-
-            if not passes_fame_filters(pop, vc, caps_now):
-                continue
-
-            # require an actual trailer/teaser (YouTube)
-            try:
-                vids = fetch_videos(mid)
-            except requests.RequestException:
-                continue
-
-            trailer = pick_trailer_url(vids)
-            if not trailer:
-                continue
-
-            rows.append({
-                "title": title,
-                "year": normalize_year(m.get("release_date")),
-                "genre": genre_name,
-                "tmdb_url": f"https://www.themoviedb.org/movie/{mid}",
-                "youtube_trailer_url": trailer,
-                "popularity": pop,
-                "vote_count": vc,
-                "original_language": m.get("original_language") or ""
-            })
-            seen_ids.add(mid)
+    # discover pages are fetched ahead in the background while earlier pages are checked
+    prefetcher = PagePrefetcher(lambda page: {"results": discover_page(client, genre_id, page)})
+    prefetcher.start(range(1, MAX_PAGES + 1))
 
+    try:
+        for page, page_data in prefetcher:
+            caps_now = adaptive_caps(page, start_caps)
+            items = page_data["results"]
+            # light shuffle to avoid clumping
+            random.shuffle(items)
+            checked = 0
+            collected_before = len(rows)
+
+            for m in items:
+                mid = m.get("id")
+                if not mid or mid in seen_ids:
+                    continue
+
+                title = m.get("title") or m.get("name") or ""
+                overview = m.get("overview") or ""
+                if is_erotic(title, overview):
+                    continue
+
+                pop = float(m.get("popularity") or 0.0)
+                vc = int(m.get("vote_count") or 0)
+
+                if not passes_fame_filters(pop, vc, caps_now):
+                    continue
+
+                # require an actual trailer/teaser (YouTube)
+                checked += 1
+                try:
+                    vids = fetch_videos(client, mid)
+                except requests.RequestException:
+                    continue
+
+                trailer = pick_trailer_url(vids)
+                if not trailer:
+                    continue
+
+                rows.append({
+                    "title": title,
+                    "year": normalize_year(m.get("release_date")),
+                    "genre": genre_name,
+                    "tmdb_url": f"https://www.themoviedb.org/movie/{mid}",
+                    "youtube_trailer_url": trailer,
+                    "popularity": pop,
+                    "vote_count": vc,
+                    "original_language": m.get("original_language") or ""
+                })
+                seen_ids.add(mid)
+
+                if len(rows) >= target:
+                    break
+
+            print(f"{genre_name:8s} | page {page:>3} | collected {len(rows):>3}/{target} "
+                  f"(caps now: pop≤{caps_now[0]}, votes {caps_now[1]}–{caps_now[2]})")
             if len(rows) >= target:
                 break
-
-        print(f"{genre_name:8s} | page {page:>3} | collected {len(rows):>3}/{target} "
-              f"(caps now: pop≤{caps_now[0]}, votes {caps_now[1]}–{caps_now[2]})")
-        page += 1
+            prefetcher.record_yield(checked, len(rows) - collected_before, target - len(rows))
+    finally:
+        # target reached: stop requesting further pages
+        prefetcher.close()
 
     return rows
 
 def main():
+    from dataset_tools.export import write_dataset
+
+    client = TMDbClient(delay=BASE_SLEEP)
     all_rows: List[Dict[str, Any]] = []
     for gname, gid in GENRES.items():
-        genre_rows = collect_for_genre(gname, gid, TARGET_PER_GENRE)
+        genre_rows = collect_for_genre(client, gname, gid, TARGET_PER_GENRE)
         if len(genre_rows) < TARGET_PER_GENRE:
             print(f"WARNING: {gname} collected {len(genre_rows)} < {TARGET_PER_GENRE}. "
                   f"You can raise MAX_POPULARITY or lower MIN_VOTE_COUNT and rerun.")
         all_rows.extend(genre_rows)
 
-    df = pd.DataFrame(all_rows, columns=[
-        "title", "year", "genre", "tmdb_url", "youtube_trailer_url",
-        "popularity", "vote_count", "original_language"
-    ])
-
     # Basic sanity: group counts
-    counts = df.groupby("genre")["title"].count().to_dict()
+    counts = dict(Counter(row["genre"] for row in all_rows))
     print("Counts per genre:", counts)
-    print("Total rows:", len(df))
+    print("Total rows:", len(all_rows))
 
-    # Write files
-    df.to_excel("movies_dataset_480.xlsx", index=False)
-    df.to_csv("movies_dataset_480.csv", index=False, encoding="utf-8")
-    df.to_json("movies_dataset_480.json", orient="records", indent=2, force_ascii=False)
-    print("Saved: movies_dataset_480.xlsx, movies_dataset_480.csv, movies_dataset_480.json")
+    # Write the canonical columnar file; other formats are exported on demand
+    write_dataset(all_rows, Path("movies_dataset_480.parquet"))
+    print("Saved: movies_dataset_480.parquet")
+    print("Export with: python -m dataset_tools export movies_dataset_480.parquet --format xlsx csv json")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,7 @@
+"""
+Tools for building and maintaining the movies dataset used by the experiment.
+
+Run ``python -m dataset_tools --help`` for the available commands. Modules only
+import their heavy dependencies (requests, pyarrow, numpy, ...) when the
+command that needs them runs.
+"""
@@ -0,0 +1,385 @@
+"""
+Rebuild the movies dataset so that:
+- Each of the four focus genres (Action, Comedy, Drama, Thriller) has exactly 120 movies
+- Every movie appears only once
+- The assigned genre matches the first genre returned by TMDb for that movie
+- Each movie has an available YouTube trailer/teaser
+- Candidates are sampled per genre across release-year bands and popularity
+  quantiles instead of taking the most popular titles first
+- The canonical Parquet dataset is written first and the app's JSON is derived from it
+- Discover pages are prefetched in the background while candidates are validated
+
+Usage:
+    1) pip install requests python-dotenv pyarrow numpy scipy
+    2) Ensure TMDB_API_KEY is set in .env or environment variables
+    3) python -m dataset_tools build
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .config import CATEGORY_CONFIG, DATASET_PATH, DISCOVER_PAGE_SIZE, MAX_PAGES, PARQUET_PATH
+from .export import load_rows, publish_dataset
+from .filters import (
+    CompiledRules,
+    compiled_category_rules,
+    load_compiled_filters,
+)
+from .prefetch import PagePrefetcher
+from .sampling import StratifiedSampler
+from .tmdb import TMDbClient, pick_trailer_url
+
+UNSAFE_TERMS = {
+    "adult",
+    "bdsm",
+    "brothel",
+    "erotic",
+    "erotica",
+    "fetish",
+    "gay",
+    "hard core",
+    "hardcore",
+    "kink",
+    "kinky",
+    "lesbian",
+    "naked",
+    "nudist",
+    "nudity",
+    "nude",
+    "orgy",
+    "porn",
+    "porno",
+    "prostitute",
+    "prostitution",
+    "sensual",
+    "seduce",
+    "seduc",
+    "seduction",
+    "sexy",
+    "sex",
+    "sexual",
+    "soft core",
+    "softcore",
+    "strip",
+    "stripper",
+    "xxx",
+}
+
+
+def normalize_year(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(value[:4])
+    except (ValueError, TypeError):
+        return None
+
+
+def is_unsafe(text: str) -> bool:
+    lowered = text.lower()
+    return any(term in lowered for term in UNSAFE_TERMS)
+
+
+def fetch_keywords(client: TMDbClient, movie_id: int) -> Optional[List[str]]:
+    payload = client.get_json(f"/movie/{movie_id}/keywords")
+    raw_keywords = payload.get("keywords") or []
+    names: List[str] = []
+    seen: Set[str] = set()
+    for item in raw_keywords:
+        name = (item.get("name") or "").strip()
+        if not name:
+            continue
+        lowered = name.lower()
+        if lowered in seen:
+            continue
+        if is_unsafe(name):
+            return None
+        seen.add(lowered)
+        names.append(name)
+    return names
+
+
+def discover_params(genre_id: int, page: int) -> Dict[str, Any]:
+    return {
+        "with_genres": genre_id,
+        "include_adult": "false",
+        "sort_by": "popularity.desc",
+        "page": page,
+        "language": "en-US",
+        "with_original_language": "",
+        "vote_count.gte": 1,
+    }
+
+
+def stream_pages(
+    client: TMDbClient,
+    genre_id: int,
+    stratified: bool,
+    rng: random.Random,
+    prefetcher: PagePrefetcher
+) -> Iterator[List[Tuple[Dict[str, Any], float]]]:
+    """Yield each discover page as shuffled (stub, popularity quantile) pairs.
+
+    Page 1 is read first to learn the result size; the remaining pages (in
+    random order for stratified runs, so every popularity quantile is reached
+    early) are fetched by the prefetcher while earlier pages are validated.
+    """
+    first_page = client.get_json("/discover/movie", discover_params(genre_id, 1))
+    page_count = min(int(first_page.get("total_pages") or 1), MAX_PAGES)
+    total = max(min(int(first_page.get("total_results") or 0), page_count * DISCOVER_PAGE_SIZE), 1)
+
+    pages = list(range(2, page_count + 1))
+    if stratified:
+        rng.shuffle(pages)
+    prefetcher.start(pages)
+
+    def ranked(page: int, page_data: Dict[str, Any]) -> List[Tuple[Dict[str, Any], float]]:
+        movies = page_data.get("results") or []
+        candidates = [
+            (movie_stub, ((page - 1) * DISCOVER_PAGE_SIZE + position) / total)
+            for position, movie_stub in enumerate(movies)
+        ]
+        # light shuffle to avoid clumping
+        rng.shuffle(candidates)
+        return candidates
+
+    yield ranked(1, first_page)
+    for page, page_data in prefetcher:
+        yield ranked(page, page_data)
+
+
+def build_row(
+    client: TMDbClient,
+    movie_stub: Dict[str, Any],
+    genre_name: str,
+    filter_rules: CompiledRules
+) -> Optional[Dict[str, Any]]:
+    movie_id = movie_stub["id"]
+    details = client.get_json(f"/movie/{movie_id}")
+    genres = details.get("genres") or []
+    if not genres:
+        return None
+    primary_genre = genres[0].get("name")
+    if primary_genre != genre_name:
+        return None
+
+    title = details.get("title") or movie_stub.get("title") or ""
+    overview = details.get("overview") or movie_stub.get("overview") or ""
+    if is_unsafe(f"{title} {overview}"):
+        return None
+
+    summary_for_filters = {
+        "id": movie_id,
+        "title": title,
+        "name": details.get("name") or movie_stub.get("name"),
+        "original_title": details.get("original_title") or movie_stub.get("original_title"),
+        "original_name": details.get("original_name") or movie_stub.get("original_name"),
+    }
+    if filter_rules.is_filtered(summary_for_filters):
+        return None
+
+    backdrop_path = details.get("backdrop_path") or movie_stub.get("backdrop_path")
+    poster_path = details.get("poster_path") or movie_stub.get("poster_path")
+    if not (backdrop_path or poster_path):
+        return None
+
+    keywords = fetch_keywords(client, movie_id)
+    if not keywords:
+        return None
+
+    videos_data = client.get_json(f"/movie/{movie_id}/videos")
+    trailer_url = pick_trailer_url(videos_data.get("results") or [])
+    if not trailer_url:
+        return None
+
+    genre_ids = []
+    stub_genres = movie_stub.get("genre_ids") or []
+    if isinstance(stub_genres, list):
+        genre_ids.extend([gid for gid in stub_genres if isinstance(gid, int)])
+    detail_genre_ids = [
+        g.get("id") for g in genres if isinstance(g, dict) and isinstance(g.get("id"), int)
+    ]
+    for gid in detail_genre_ids:
+        if gid not in genre_ids:
+            genre_ids.append(gid)
+
+    return {
+        "id": movie_id,
+        "title": title,
+        "original_title": details.get("original_title") or movie_stub.get("original_title") or title,
+        "overview": overview,
+        "genre_ids": genre_ids,
+        "year": normalize_year(details.get("release_date")),
+        "release_date": details.get("release_date"),
+        "genre": genre_name,
+        "tmdb_url": f"https://www.themoviedb.org/movie/{movie_id}",
+        "youtube_trailer_url": trailer_url,
+        "poster_path": poster_path,
+        "backdrop_path": backdrop_path,
+        "vote_average": float(details.get("vote_average") or movie_stub.get("vote_average") or 0.0),
+        "popularity": float(details.get("popularity") or movie_stub.get("popularity") or 0.0),
+        "vote_count": int(details.get("vote_count") or movie_stub.get("vote_count") or 0),
+        "original_language": details.get("original_language") or movie_stub.get("original_language") or "",
+        "keywords": keywords,
+    }
+
+
+def add_fallback_row(
+    client: TMDbClient,
+    sampler: StratifiedSampler,
+    movie_stub: Dict[str, Any],
+    genre_name: str,
+    filter_rules: CompiledRules,
+    used_movie_ids: Set[int]
+) -> bool:
+    movie_id = movie_stub["id"]
+    if movie_id in used_movie_ids:
+        return False
+    row = build_row(client, movie_stub, genre_name, filter_rules)
+    if not row:
+        return False
+    sampler.add_fallback(row)
+    used_movie_ids.add(movie_id)
+    return True
+
+
+def collect_for_genre(
+    client: TMDbClient,
+    category: Dict[str, Any],
+    target: int,
+    filter_rules: CompiledRules,
+    used_movie_ids: Set[int],
+    stratified: bool,
+    rng: random.Random
+) -> StratifiedSampler:
+    genre_name = category["label"]
+    if stratified:
+        sampler = StratifiedSampler(target, rng=rng)
+    else:
+        # First come, first served in popularity order: one stratum for the whole target.
+        sampler = StratifiedSampler(
+            target, year_bands=[(None, None)], popularity_bands=1, max_rejections=None, rng=rng
+        )
+
+    genre_id = category["genre_id"]
+    validated_ids: Set[int] = set()
+    prefetcher = PagePrefetcher(lambda page: client.get_json("/discover/movie", discover_params(genre_id, page)))
+    try:
+        for candidates in stream_pages(client, genre_id, stratified, rng, prefetcher):
+            validated = accepted = 0
+            for movie_stub, popularity_quantile in candidates:
+                if sampler.complete:
+                    break
+                movie_id = movie_stub.get("id")
+                if not movie_id or movie_id in used_movie_ids:
+                    continue
+                if movie_stub.get("adult"):
+                    continue
+
+                stratum = sampler.stratum(normalize_year(movie_stub.get("release_date")), popularity_quantile)
+                if sampler.wants(stratum):
+                    validated += 1
+                    validated_ids.add(movie_id)
+                    row = build_row(client, movie_stub, genre_name, filter_rules)
+                    if row:
+                        sampler.add(stratum, row)
+                        used_movie_ids.add(movie_id)
+                        accepted += 1
+                    else:
+                        sampler.reject(stratum)
+                    continue
+                if not sampler.strata_done:
+                    sampler.offer(movie_stub)
+                    continue
+
+                # Every stratum is full or closed but the target is not met: top up
+                # from the reservoir first, then from this and the following pages.
+                for fallback_stub in sampler.drain_reservoir() + [movie_stub]:
+                    if sampler.complete:
+                        break
+                    validated += 1
+                    validated_ids.add(fallback_stub["id"])
+                    if add_fallback_row(client, sampler, fallback_stub, genre_name, filter_rules, used_movie_ids):
+                        accepted += 1
+            if sampler.complete:
+                break
+            prefetcher.record_yield(validated, accepted, sampler.target - sampler.collected)
+    finally:
+        # Quota reached (or an error): no further discover pages are requested.
+        prefetcher.close()
+
+    # Pages ran out with strata still open: top up from the overflow reservoir.
+    for movie_stub in sampler.drain_reservoir():
+        if sampler.complete:
+            break
+        validated_ids.add(movie_stub["id"])
+        add_fallback_row(client, sampler, movie_stub, genre_name, filter_rules, used_movie_ids)
+
+    if not sampler.complete and stratified:
+        # Still short: overflow that did not fit the reservoir was dropped, so go over the
+        # pages again in popularity order and try every candidate not validated yet.
+        prefetcher = PagePrefetcher(lambda page: client.get_json("/discover/movie", discover_params(genre_id, page)))
+        try:
+            for candidates in stream_pages(client, genre_id, False, rng, prefetcher):
+                for movie_stub, _ in candidates:
+                    if sampler.complete:
+                        break
+                    movie_id = movie_stub.get("id")
+                    if not movie_id or movie_id in validated_ids or movie_stub.get("adult"):
+                        continue
+                    validated_ids.add(movie_id)
+                    add_fallback_row(client, sampler, movie_stub, genre_name, filter_rules, used_movie_ids)
+                if sampler.complete:
+                    break
+                prefetcher.record_yield(len(candidates), 0, sampler.target - sampler.collected)
+        finally:
+            prefetcher.close()
+
+    return sampler
+
+
+def run(args: argparse.Namespace) -> None:
+    client = TMDbClient()
+    target = args.target
+    stratified = args.sampling == "stratified"
+    rng = random.Random(args.seed)
+
+    existing_movies = load_rows(PARQUET_PATH)
+    category_filters = compiled_category_rules(load_compiled_filters(existing_movies))
+
+    # Rebuilding only some categories keeps the other genres' rows as they are.
+    selected = [c for c in CATEGORY_CONFIG if not args.categories or c["id"] in args.categories]
+    selected_labels = {category["label"] for category in selected}
+    results: List[Dict[str, Any]] = [
+        movie for movie in existing_movies
+        if args.categories and movie.get("genre") not in selected_labels
+    ]
+    used_movie_ids: Set[int] = {movie["id"] for movie in results if movie.get("id") is not None}
+
+    for category in selected:
+        genre_name = category["label"]
+        sampler = collect_for_genre(
+            client,
+            category,
+            target,
+            category_filters[category["id"]],
+            used_movie_ids,
+            stratified,
+            rng
+        )
+        collected = sampler.sample()
+
+        if len(collected) < target:
+            raise SystemExit(f"Could not collect enough movies for {genre_name}: gathered {len(collected)}")
+
+        results.extend(collected)
+        print(f"{genre_name}: collected {len(collected)} movies.")
+        if stratified:
+            print(f"  strata (collected:quota per popularity quartile): {sampler.summary()}")
+
+    results.sort(key=lambda item: (item["genre"], item["title"]))
+    publish_dataset(results)
+    print(f"Dataset written to {PARQUET_PATH} and {DATASET_PATH} with {len(results)} movies.")
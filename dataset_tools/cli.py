@@ -0,0 +1,111 @@
+"""
+Command line entry point. Each command names the module that implements it; the
+module (and with it requests, pyarrow, numpy, ...) is only imported when that
+command runs, so --help and offline commands start quickly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+from pathlib import Path
+from typing import List, Optional
+
+from .config import (
+    ADJECTIVES,
+    CATEGORY_CONFIG,
+    DATASET_PATH,
+    MOVIES_PER_CATEGORY,
+    OEMBED_ENDPOINT,
+    PARQUET_PATH,
+    ROUNDS_COUNT,
+    TARGET_PER_GENRE,
+    TRAILER_CHECK_TTL_SECONDS,
+    TRAILER_CHECK_WORKERS,
+)
+
+EXPORT_FORMATS = ("json", "csv", "xlsx", "arrow")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m dataset_tools",
+        description="Build and maintain the experiment movies dataset."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    build = commands.add_parser("build", help="collect the dataset from TMDb (primary genre per movie)")
+    build.add_argument("--target", type=int, default=TARGET_PER_GENRE, help="movies per genre")
+    build.add_argument("--sampling", choices=("stratified", "popularity"), default="stratified",
+                       help="spread picks over year bands and popularity quantiles, "
+                            "or take the most popular qualifying titles first")
+    build.add_argument("--seed", type=int, default=None)
+    build.add_argument("--categories", nargs="+", choices=[c["id"] for c in CATEGORY_CONFIG], default=None,
+                       help="rebuild only these categories and keep the other genres' rows")
+    build.set_defaults(handler="build")
+
+    dedupe = commands.add_parser("dedupe", help="merge duplicate movies and reassign primary genres")
+    dedupe.set_defaults(handler="dedupe")
+
+    filters = commands.add_parser("filters", help="compile the manual genre filters for the app and tools")
+    filters.set_defaults(handler="filters")
+
+    validate = commands.add_parser("validate", help="check the dataset offline")
+    validate.add_argument("dataset", nargs="?", type=Path, default=DATASET_PATH)
+    validate.add_argument("--target", type=int, default=TARGET_PER_GENRE, help="movies per genre")
+    validate.set_defaults(handler="validate")
+
+    export = commands.add_parser("export", help="derive JSON/CSV/Excel/Arrow files from the Parquet dataset")
+    export.add_argument("source", nargs="?", type=Path, default=PARQUET_PATH)
+    export.add_argument("--format", nargs="+", choices=EXPORT_FORMATS, default=["json"], dest="formats")
+    export.add_argument("--out-dir", type=Path, default=None,
+                        help="defaults to the source directory")
+    export.add_argument("--from-json", type=Path, default=None,
+                        help="(re)create the Parquet source from an existing JSON dataset first")
+    export.set_defaults(handler="export")
+
+    trailers = commands.add_parser("trailers", help="check that the dataset's YouTube trailers are still available")
+    trailers.add_argument("--fix", action="store_true",
+                          help="replace unavailable trailers with the next-best TMDb video and rewrite the dataset")
+    trailers.add_argument("--endpoint", default=OEMBED_ENDPOINT, help="oEmbed-style endpoint to check against")
+    trailers.add_argument("--workers", type=int, default=TRAILER_CHECK_WORKERS)
+    trailers.add_argument("--ttl", type=float, default=TRAILER_CHECK_TTL_SECONDS,
+                          help="seconds a cached result stays valid; 0 re-checks everything")
+    trailers.set_defaults(handler="trailers")
+
+    diff = commands.add_parser("diff", help="changelog and patch between two dataset versions")
+    diff.add_argument("old", type=Path)
+    diff.add_argument("new", nargs="?", type=Path, default=DATASET_PATH)
+    diff.add_argument("--changelog", type=Path, default=None, help="write the structured changelog here")
+    diff.add_argument("--patch", type=Path, default=None, help="write a patch that turns old into new here")
+    diff.set_defaults(handler="diff")
+
+    patch = commands.add_parser("patch", help="apply a patch written by the diff command")
+    patch.add_argument("base", type=Path)
+    patch.add_argument("patch", type=Path)
+    patch.add_argument("--output", type=Path, default=None, help="defaults to overwriting the base")
+    patch.set_defaults(handler="diff")
+
+    index = commands.add_parser("index", help="build the keyword neighbour index")
+    index.set_defaults(handler="keyword_index")
+
+    simulate = commands.add_parser("simulate", help="simulate round assignment balance")
+    simulate.add_argument("--participants", type=int, default=100_000)
+    simulate.add_argument("--rounds", type=int, default=ROUNDS_COUNT)
+    simulate.add_argument("--movies-per-category", type=int, default=MOVIES_PER_CATEGORY)
+    simulate.add_argument("--adjectives", type=int, default=len(ADJECTIVES),
+                          help="use only the first N adjectives")
+    simulate.add_argument("--batch-size", type=int, default=5_000)
+    simulate.add_argument("--seed", type=int, default=None)
+    simulate.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    simulate.add_argument("--output", type=Path, default=None,
+                          help="write the exposure and co-occurrence matrices to this .npz file")
+    simulate.set_defaults(handler="simulate")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    module = importlib.import_module(f".{args.handler}", __package__)
+    module.run(args)
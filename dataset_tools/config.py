@@ -0,0 +1,70 @@
+"""Shared paths and settings for the dataset tools (standard library only)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+CATEGORY_CONFIG = [
+    {"id": "action", "label": "Action", "genre_id": 28},
+    {"id": "comedy", "label": "Comedy", "genre_id": 35},
+    {"id": "drama", "label": "Drama", "genre_id": 18},
+    {"id": "thriller", "label": "Thriller", "genre_id": 53},
+]
+TARGET_PER_GENRE = 120
+
+DATASET_PATH = Path("public/movies_dataset_480.json")
+PARQUET_PATH = Path("data/movies_dataset_480.parquet")
+MANUAL_FILTERS_PATH = Path("src/utils/manualGenreFilters.json")
+COMPILED_FILTERS_PATH = Path("src/utils/manualGenreFilters.compiled.json")
+KEYWORD_INDEX_PATH = Path("public/movies_keyword_neighbours.json")
+TRAILER_CHECKS_PATH = Path("data/trailer_checks.json")
+
+API_BASE = "https://api.themoviedb.org/3"
+REQUEST_DELAY_SECONDS = 0.3  # keep within TMDb rate limits
+REQUEST_TIMEOUT_SECONDS = 30
+REQUEST_ATTEMPTS = 3
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+MAX_PAGES = 500
+DISCOVER_PAGE_SIZE = 20
+
+# Discover pages are fetched on a background thread ahead of candidate
+# validation. The lookahead shrinks while pages keep validation busy and grows
+# while most of their candidates are skipped.
+PREFETCH_MIN_PAGES = 1
+PREFETCH_MAX_PAGES = 8
+PREFETCH_WORK_AHEAD = 4  # validations' worth of candidates to keep queued
+PREFETCH_YIELD_SMOOTHING = 0.3
+
+# Trailer availability checks go through an oEmbed-style endpoint (?url=...&format=json).
+OEMBED_ENDPOINT = "https://www.youtube.com/oembed"
+TRAILER_CHECK_WORKERS = 8
+TRAILER_CHECK_TTL_SECONDS = 7 * 24 * 3600
+
+# Strata for the candidate sampler: release-year bands (inclusive, open-ended at
+# the edges) crossed with popularity quantiles of the discover result set.
+SAMPLING_YEAR_BANDS = [(None, 1989), (1990, 1999), (2000, 2009), (2010, 2019), (2020, None)]
+SAMPLING_POPULARITY_BANDS = 4
+SAMPLING_RESERVOIR_SIZE = 500
+SAMPLING_MAX_REJECTIONS = 40  # consecutive failed candidates before a stratum is given up
+
+# Mirrors src/utils/experimentConfig.js
+EXPERIMENT_CONDITIONS = [
+    {
+        "id": f"{int(use_adjectives)}{int(use_preview)}{int(show_ratings)}",
+        "useAdjectives": use_adjectives,
+        "usePreview": use_preview,
+        "showRatings": show_ratings,
+    }
+    for use_adjectives in (False, True)
+    for use_preview in (False, True)
+    for show_ratings in (False, True)
+]
+ADJECTIVES = [
+    "Captivating", "Enchanting", "Daring", "Heartwarming", "Intriguing",
+    "Intense", "Magical", "Immersive", "Unpredictable", "Moving", "Gritty",
+    "Brilliant", "Spectacular", "Thrilling", "Sparkling", "Stylish", "Bold",
+    "Stunning", "Refreshing", "Uplifting", "Alluring", "Surprising", "Fiery",
+]
+MOVIES_PER_CATEGORY = 15
+ROUNDS_COUNT = 8
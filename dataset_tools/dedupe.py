@@ -0,0 +1,70 @@
+"""
+Collapse duplicate TMDb entries in the dataset and assign each movie the first
+genre TMDb lists for it (falling back to a focus genre already in the dataset).
+
+Usage:
+    python -m dataset_tools dedupe
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .config import CATEGORY_CONFIG, DATASET_PATH, PARQUET_PATH
+from .export import publish_dataset, read_dataset
+from .tmdb import TMDbClient
+
+ALLOWED_GENRES = {category["label"] for category in CATEGORY_CONFIG}
+
+
+def extract_movie_id(tmdb_url: str) -> str:
+    return tmdb_url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def fetch_first_genre(client: TMDbClient, movie_id: str, cache: Dict[str, Optional[str]]) -> Optional[str]:
+    if movie_id in cache:
+        return cache[movie_id]
+
+    genres = client.get_json(f"/movie/{movie_id}").get("genres") or []
+    primary = genres[0]["name"] if genres else None
+    cache[movie_id] = primary
+    return primary
+
+
+def run(args: argparse.Namespace) -> None:
+    data = read_dataset(PARQUET_PATH).to_pylist()
+
+    client = TMDbClient()
+
+    grouped: Dict[str, List[dict]] = defaultdict(list)
+    id_order: List[str] = []
+    seen_ids = set()
+
+    for entry in data:
+        movie_id = extract_movie_id(entry["tmdb_url"])
+        grouped[movie_id].append(entry)
+        if movie_id not in seen_ids:
+            id_order.append(movie_id)
+            seen_ids.add(movie_id)
+
+    cache: Dict[str, Optional[str]] = {}
+    deduped: List[dict] = []
+
+    for movie_id in id_order:
+        entries = grouped[movie_id]
+        base_entry = entries[0].copy()
+        primary_genre = fetch_first_genre(client, movie_id, cache)
+
+        if primary_genre:
+            if primary_genre not in ALLOWED_GENRES:
+                # Fallback to an allowed genre already captured in the dataset.
+                fallback = next((item["genre"] for item in entries if item["genre"] in ALLOWED_GENRES), None)
+                base_entry["genre"] = fallback or primary_genre
+            else:
+                base_entry["genre"] = primary_genre
+        deduped.append(base_entry)
+
+    publish_dataset(deduped)
+    print(f"Dataset written to {PARQUET_PATH} and {DATASET_PATH} with {len(deduped)} movies ({len(data) - len(deduped)} duplicates removed).")
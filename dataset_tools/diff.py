@@ -0,0 +1,259 @@
+"""
+Compare two versions of the movies dataset by TMDb id:
+- Both files are streamed (JSON arrays or Parquet); only compact per-field
+  hashes of the old version are held in memory
+- The changelog lists added, removed and changed movies, with the changed ids
+  per field so caches (images, prebuilt rounds, CDN shards) can invalidate
+  just those entries
+- The patch holds only what differs and can be applied to the old version to
+  reproduce the new one exactly
+
+Usage:
+    python -m dataset_tools diff old.json public/movies_dataset_480.json --changelog changes.json --patch update.patch.json
+    python -m dataset_tools patch data/movies_dataset_480.parquet update.patch.json
+
+Patching the app dataset (either its Parquet or its JSON) rewrites both files
+and refreshes the compiled filters and keyword index.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .config import DATASET_PATH, PARQUET_PATH
+
+PATCH_VERSION = 1
+READ_CHUNK_SIZE = 1 << 16
+# Fields shown next to ids in the changelog so it can be read without the dataset.
+LABEL_FIELDS = ("title", "genre")
+
+
+def iter_json_array(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the objects of a top-level JSON array without parsing the whole file at once."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    with path.open("r", encoding="utf-8") as handle:
+        eof = False
+        while True:
+            buffer = buffer.lstrip(" \t\r\n,")
+            if not started and buffer:
+                if buffer[0] != "[":
+                    raise SystemExit(f"{path} is not a JSON array.")
+                started = True
+                buffer = buffer[1:].lstrip(" \t\r\n")
+            if started and buffer.startswith("]"):
+                return
+            if started and buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield item
+                    buffer = buffer[end:]
+                    continue
+            if eof:
+                if not started:
+                    raise SystemExit(f"{path} is empty.")
+                raise SystemExit(f"{path} ends before the array is closed.")
+            chunk = handle.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+
+
+def iter_dataset(path: Path) -> Iterator[Dict[str, Any]]:
+    if not path.exists():
+        raise SystemExit(f"Dataset not found at {path}")
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+        return
+    yield from iter_json_array(path)
+
+
+def value_hash(value: Any) -> bytes:
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).digest()
+
+
+def row_label(row: Dict[str, Any]) -> Dict[str, Any]:
+    label = {"id": row.get("id")}
+    label.update({field: row.get(field) for field in LABEL_FIELDS if field in row})
+    return label
+
+
+def index_rows(path: Path) -> Tuple[Dict[Any, Dict[str, bytes]], Dict[Any, Dict[str, Any]], List[Any], str]:
+    """Per-field hashes and labels by id, id order, and the version fingerprint."""
+    hashes: Dict[Any, Dict[str, bytes]] = {}
+    labels: Dict[Any, Dict[str, Any]] = {}
+    order: List[Any] = []
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for row in iter_dataset(path):
+        movie_id = row.get("id")
+        if movie_id is None:
+            raise SystemExit(f"{path}: every movie needs an id to be diffed.")
+        if movie_id in hashes:
+            raise SystemExit(f"{path}: id {movie_id} appears more than once.")
+        hashes[movie_id] = {field: value_hash(value) for field, value in row.items()}
+        labels[movie_id] = row_label(row)
+        order.append(movie_id)
+        fingerprint.update(value_hash(row))
+    return hashes, labels, order, fingerprint.hexdigest()
+
+
+def diff_datasets(old_path: Path, new_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    old_hashes, old_labels, _, old_fingerprint = index_rows(old_path)
+
+    added: List[Dict[str, Any]] = []
+    changed: List[Dict[str, Any]] = []
+    by_field: Dict[str, List[Any]] = {}
+    upsert: Dict[str, Dict[str, Any]] = {}
+    unset: Dict[str, List[str]] = {}
+    order: List[Any] = []
+    seen = set()
+    unchanged = 0
+    fingerprint = hashlib.blake2b(digest_size=16)
+
+    for row in iter_dataset(new_path):
+        movie_id = row.get("id")
+        if movie_id is None:
+            raise SystemExit(f"{new_path}: every movie needs an id to be diffed.")
+        if movie_id in seen:
+            raise SystemExit(f"{new_path}: id {movie_id} appears more than once.")
+        seen.add(movie_id)
+        order.append(movie_id)
+        fingerprint.update(value_hash(row))
+
+        previous = old_hashes.get(movie_id)
+        if previous is None:
+            added.append(row_label(row))
+            upsert[str(movie_id)] = row
+            continue
+
+        fields = [field for field, value in row.items() if previous.get(field) != value_hash(value)]
+        removed_fields = [field for field in previous if field not in row]
+        if not fields and not removed_fields:
+            unchanged += 1
+            continue
+        for field in fields + removed_fields:
+            by_field.setdefault(field, []).append(movie_id)
+        entry = row_label(row)
+        entry["fields"] = fields + removed_fields
+        if "genre" in fields:
+            entry["previous_genre"] = old_labels[movie_id].get("genre")
+        changed.append(entry)
+        if fields:
+            upsert[str(movie_id)] = {field: row[field] for field in fields}
+        if removed_fields:
+            unset[str(movie_id)] = removed_fields
+
+    removed = [old_labels[movie_id] for movie_id in old_hashes if movie_id not in seen]
+    target_fingerprint = fingerprint.hexdigest()
+
+    changelog = {
+        "version": PATCH_VERSION,
+        "old": {"path": str(old_path), "count": len(old_hashes), "fingerprint": old_fingerprint},
+        "new": {"path": str(new_path), "count": len(order), "fingerprint": target_fingerprint},
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "unchanged": unchanged,
+            "fields": {field: len(ids) for field, ids in sorted(by_field.items())},
+        },
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "by_field": dict(sorted(by_field.items())),
+    }
+    patch = {
+        "version": PATCH_VERSION,
+        "base": old_fingerprint,
+        "target": target_fingerprint,
+        "remove": [label["id"] for label in removed],
+        "upsert": upsert,
+        "unset": unset,
+        "order": order,
+    }
+    return changelog, patch
+
+
+def apply_patch(base_path: Path, patch: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if patch.get("version") != PATCH_VERSION:
+        raise SystemExit("Unsupported patch version.")
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for row in iter_dataset(base_path):
+        rows[str(row.get("id"))] = row
+        fingerprint.update(value_hash(row))
+    if fingerprint.hexdigest() != patch.get("base"):
+        raise SystemExit(f"{base_path} is not the version this patch was made from.")
+
+    for movie_id in patch.get("remove") or []:
+        rows.pop(str(movie_id), None)
+    for movie_id, fields in (patch.get("upsert") or {}).items():
+        rows.setdefault(movie_id, {}).update(fields)
+    for movie_id, fields in (patch.get("unset") or {}).items():
+        for field in fields:
+            rows[movie_id].pop(field, None)
+
+    result = [rows[str(movie_id)] for movie_id in patch.get("order") or []]
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for row in result:
+        fingerprint.update(value_hash(row))
+    if fingerprint.hexdigest() != patch.get("target"):
+        raise SystemExit("Patched dataset does not match the patch target; not writing it.")
+    return result
+
+
+def write_json(data: Any, path: Path) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.command == "patch":
+        run_patch(args)
+        return
+
+    changelog, patch = diff_datasets(args.old, args.new)
+    summary = changelog["summary"]
+    print(f"{summary['added']} added, {summary['removed']} removed, "
+          f"{summary['changed']} changed, {summary['unchanged']} unchanged")
+    for field, count in summary["fields"].items():
+        print(f"  {field}: {count}")
+    if args.changelog:
+        write_json(changelog, args.changelog)
+        print(f"Changelog written to {args.changelog}")
+    if args.patch:
+        write_json(patch, args.patch)
+        print(f"Patch written to {args.patch}")
+
+
+def run_patch(args: argparse.Namespace) -> None:
+    patch = json.loads(args.patch.read_text(encoding="utf-8"))
+    rows = apply_patch(args.base, patch)
+    output = args.output or args.base
+    if output.resolve() in (PARQUET_PATH.resolve(), DATASET_PATH.resolve()):
+        # The app dataset is derived from the canonical Parquet file, and the
+        # compiled filters and keyword index from the dataset.
+        from .export import publish_dataset
+
+        publish_dataset(rows)
+        print(f"Patched dataset written to {PARQUET_PATH} and {DATASET_PATH} with {len(rows)} movies.")
+        return
+    if output.suffix == ".parquet":
+        from .export import write_dataset
+
+        write_dataset(rows, output)
+    else:
+        output.write_text(json.dumps(rows, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Patched dataset written to {output} with {len(rows)} movies.")
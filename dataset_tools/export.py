@@ -0,0 +1,190 @@
+"""
+Write and export the canonical columnar movies dataset:
+- The builders write one Parquet file with proper list columns (keywords, genre_ids)
+- JSON, CSV, Excel and Arrow IPC copies are derived from it on demand
+- Excel support is optional; openpyxl is only imported when xlsx is requested
+- Arrow IPC output can be memory-mapped directly by analysis notebooks
+
+Usage:
+    1) pip install pyarrow (and openpyxl for --format xlsx)
+    2) python -m dataset_tools export --format json csv
+       python -m dataset_tools export data/movies_dataset_480.parquet --format xlsx --out-dir exports
+       python -m dataset_tools export --from-json public/movies_dataset_480.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import DATASET_PATH, PARQUET_PATH
+
+# Known columns get fixed types; anything else a builder adds is inferred.
+DATASET_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("title", pa.string()),
+    ("original_title", pa.string()),
+    ("overview", pa.string()),
+    ("genre_ids", pa.list_(pa.int32())),
+    ("year", pa.int32()),
+    ("release_date", pa.string()),
+    ("genre", pa.string()),
+    ("tmdb_url", pa.string()),
+    ("youtube_trailer_url", pa.string()),
+    ("poster_path", pa.string()),
+    ("backdrop_path", pa.string()),
+    ("vote_average", pa.float64()),
+    ("popularity", pa.float64()),
+    ("vote_count", pa.int64()),
+    ("original_language", pa.string()),
+    ("keywords", pa.list_(pa.string())),
+])
+
+
+def rows_to_table(rows: List[Dict[str, Any]]) -> pa.Table:
+    columns: List[str] = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    fields = []
+    for name in columns:
+        index = DATASET_SCHEMA.get_field_index(name)
+        if index >= 0:
+            fields.append(DATASET_SCHEMA.field(index))
+        else:
+            inferred = pa.array([row.get(name) for row in rows]).type
+            fields.append(pa.field(name, inferred))
+    schema = pa.schema(fields)
+    return pa.Table.from_pylist([{name: row.get(name) for name in columns} for row in rows], schema=schema)
+
+
+def write_dataset(rows: List[Dict[str, Any]], path: Path = PARQUET_PATH) -> pa.Table:
+    table = rows_to_table(rows)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path, compression="zstd")
+    return table
+
+
+def read_dataset(path: Path = PARQUET_PATH) -> pa.Table:
+    if not path.exists():
+        raise SystemExit(f"Dataset not found at {path}")
+    return pq.read_table(path, memory_map=True)
+
+
+def load_rows(path: Path = PARQUET_PATH) -> List[Dict[str, Any]]:
+    """Rows of the canonical dataset, or none before the first build."""
+    if not path.exists():
+        return []
+    return read_dataset(path).to_pylist()
+
+
+def save_dataset(rows: List[Dict[str, Any]]) -> pa.Table:
+    """Write the canonical Parquet dataset and the app's JSON derived from it."""
+    table = write_dataset(rows, PARQUET_PATH)
+    export_json(table, DATASET_PATH)
+    return table
+
+
+def publish_dataset(rows: List[Dict[str, Any]]) -> pa.Table:
+    """Save the dataset and refresh everything derived from it: compiled filters and the keyword index."""
+    from .filters import write_compiled_filters
+    from .keyword_index import write_keyword_index
+
+    table = save_dataset(rows)
+    write_compiled_filters(rows)
+    write_keyword_index(rows)
+    return table
+
+
+def flatten_cell(value: Any, separator: str) -> Any:
+    if isinstance(value, list):
+        return separator.join("" if item is None else str(item) for item in value)
+    return value
+
+
+def export_json(table: pa.Table, path: Path, indent: Optional[int] = 2) -> None:
+    text = json.dumps(
+        table.to_pylist(),
+        indent=indent,
+        ensure_ascii=False,
+        separators=None if indent else (",", ":"),
+    )
+    path.write_text(text, encoding="utf-8")
+
+
+def export_csv(table: pa.Table, path: Path) -> None:
+    # List cells are written as JSON arrays so they survive a round trip.
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(table.column_names)
+        for row in table.to_pylist():
+            writer.writerow([
+                json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+                for value in row.values()
+            ])
+
+
+def export_xlsx(table: pa.Table, path: Path) -> None:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise SystemExit("Excel export needs openpyxl: pip install openpyxl")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("movies")
+    sheet.append(table.column_names)
+    for row in table.to_pylist():
+        sheet.append([flatten_cell(value, ", ") for value in row.values()])
+    workbook.save(path)
+
+
+def export_arrow(table: pa.Table, path: Path) -> None:
+    # Uncompressed IPC so readers can memory-map it without a copy.
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+EXPORTERS = {
+    "json": export_json,
+    "csv": export_csv,
+    "xlsx": export_xlsx,
+    "arrow": export_arrow,
+}
+
+
+def export_dataset(table: pa.Table, formats: Iterable[str], out_dir: Path, stem: str) -> List[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+    for fmt in formats:
+        target = out_dir / f"{stem}.{fmt}"
+        EXPORTERS[fmt](table, target)
+        written.append(target)
+    return written
+
+
+def run(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+
+    if args.from_json:
+        rows = json.loads(args.from_json.read_text(encoding="utf-8"))
+        if not isinstance(rows, list):
+            raise SystemExit("Dataset is not a list.")
+        write_dataset(rows, args.source)
+        print(f"Parquet dataset written to {args.source} ({args.source.stat().st_size} bytes).")
+
+    table = read_dataset(args.source)
+    out_dir = args.out_dir or args.source.parent
+    for path in export_dataset(table, args.formats, out_dir, args.source.stem):
+        print(f"Saved {path} ({path.stat().st_size} bytes)")
+    print(f"{table.num_rows} rows exported in {time.perf_counter() - started:.2f}s")
+
@@ -0,0 +1,330 @@
+"""
+Manual include/exclude rules from src/utils/manualGenreFilters.json.
+
+compile_filters resolves the default, category, genre-ID and label layers into
+one entry per category and per genre, and resolves every dataset movie against
+them. The result is written to src/utils/manualGenreFilters.compiled.json and
+read by both the Python tools and the browser. A dataset movie then needs one
+set lookup. Other movies, such as live TMDb candidates, are checked against the
+pre-normalised rule sets.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .config import CATEGORY_CONFIG, COMPILED_FILTERS_PATH, DATASET_PATH, MANUAL_FILTERS_PATH
+
+COMPILED_FILTERS_VERSION = 1
+RULE_KEYS = (
+    ("exclude_ids", "excludeIds"),
+    ("exclude_titles", "excludeTitles"),
+    ("include_ids", "includeIds"),
+    ("include_titles", "includeTitles"),
+)
+
+
+def read_manual_filters_source() -> str:
+    if not MANUAL_FILTERS_PATH.exists():
+        return ""
+    return MANUAL_FILTERS_PATH.read_text(encoding="utf-8")
+
+
+def load_manual_filters() -> Dict[str, Any]:
+    source_text = read_manual_filters_source()
+    return json.loads(source_text) if source_text.strip() else {}
+
+
+def to_id_set(values: Optional[List[Any]]) -> Set[str]:
+    if not isinstance(values, list):
+        return set()
+    result = set()
+    for value in values:
+        if value is None:
+            continue
+        text = str(value).strip()
+        if text:
+            result.add(text)
+    return result
+
+
+def to_title_set(values: Optional[List[Any]]) -> Set[str]:
+    if not isinstance(values, list):
+        return set()
+    result = set()
+    for value in values:
+        if value is None:
+            continue
+        text = str(value).strip().lower()
+        if text:
+            result.add(text)
+    return result
+
+
+def merge_filter_configs(configs: List[Dict[str, Any]]) -> Optional[Dict[str, Set[str]]]:
+    exclude_ids: Set[str] = set()
+    exclude_titles: Set[str] = set()
+    include_ids: Set[str] = set()
+    include_titles: Set[str] = set()
+
+    for config in configs:
+        if not isinstance(config, dict):
+            continue
+        exclude = config.get("exclude") or {}
+        include_only = config.get("includeOnly") or {}
+
+        exclude_ids |= to_id_set(exclude.get("ids"))
+        exclude_titles |= to_title_set(exclude.get("titles"))
+        include_ids |= to_id_set(include_only.get("ids"))
+        include_titles |= to_title_set(include_only.get("titles"))
+
+    if not (exclude_ids or exclude_titles or include_ids or include_titles):
+        return None
+
+    return {
+        "exclude_ids": exclude_ids,
+        "exclude_titles": exclude_titles,
+        "include_ids": include_ids,
+        "include_titles": include_titles
+    }
+
+
+def get_manual_filter_keys(label: str) -> List[str]:
+    trimmed = (label or "").strip().lower()
+    if not trimmed:
+        return []
+    slug = trimmed.replace(" ", "-")
+    return [trimmed] if slug == trimmed else [trimmed, slug]
+
+
+def collect_manual_configs(
+    filters: Dict[str, Any],
+    category_id: Optional[str],
+    required_genre_ids: Optional[List[int]],
+    extra_keys: Optional[List[str]]
+) -> List[Dict[str, Any]]:
+    if not filters:
+        return []
+    configs: List[Dict[str, Any]] = []
+    fallback = filters.get("default")
+    if isinstance(fallback, dict):
+        configs.append(fallback)
+
+    if category_id and isinstance(filters.get(category_id), dict):
+        configs.append(filters[category_id])
+
+    if required_genre_ids:
+        for gid in required_genre_ids:
+            key = str(gid)
+            config = filters.get(key)
+            if isinstance(config, dict):
+                configs.append(config)
+
+    if extra_keys:
+        for key in extra_keys:
+            config = filters.get(key)
+            if isinstance(config, dict):
+                configs.append(config)
+
+    return configs
+
+
+def is_filtered_by_manual_rules(movie: Dict[str, Any], filters: Optional[Dict[str, Set[str]]]) -> bool:
+    if not filters:
+        return False
+
+    movie_id = movie.get("id")
+    id_str = str(movie_id).strip() if movie_id is not None else None
+    title = (
+        movie.get("title")
+        or movie.get("name")
+        or movie.get("original_title")
+        or movie.get("original_name")
+        or ""
+    ).strip().lower()
+
+    include_ids = filters.get("include_ids", set())
+    include_titles = filters.get("include_titles", set())
+
+    if include_ids or include_titles:
+        matches_include = (
+            (id_str and id_str in include_ids)
+            or (title and title in include_titles)
+        )
+        if not matches_include:
+            return True
+
+    exclude_ids = filters.get("exclude_ids", set())
+    exclude_titles = filters.get("exclude_titles", set())
+    if (id_str and id_str in exclude_ids) or (title and title in exclude_titles):
+        return True
+
+    return False
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_fingerprint(movies: Iterable[Dict[str, Any]]) -> str:
+    # Resolution only depends on ids and titles, not on the rest of each row.
+    lines = sorted(
+        f"{movie.get('id')}\t{movie.get('title') or ''}\t{movie.get('original_title') or ''}"
+        for movie in movies
+    )
+    return hash_text("\n".join(lines))
+
+
+def category_rules(filters: Dict[str, Any], category: Dict[str, Any]) -> Optional[Dict[str, Set[str]]]:
+    return merge_filter_configs(collect_manual_configs(
+        filters,
+        category_id=category.get("id"),
+        required_genre_ids=[category["genre_id"]] if category.get("genre_id") else None,
+        extra_keys=get_manual_filter_keys(category.get("label", ""))
+    ))
+
+
+def compile_entry(
+    rules: Optional[Dict[str, Set[str]]],
+    movies: List[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    if not rules:
+        return None
+    entry: Dict[str, Any] = {camel: sorted(rules[snake]) for snake, camel in RULE_KEYS}
+    entry["blockedIds"] = sorted(
+        str(movie["id"]) for movie in movies
+        if movie.get("id") is not None and is_filtered_by_manual_rules(movie, rules)
+    )
+    entry["hash"] = hash_text(json.dumps(entry, sort_keys=True))
+    return entry
+
+
+def compile_filters(source_text: str, movies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    filters = json.loads(source_text) if source_text.strip() else {}
+    entries: Dict[str, Optional[Dict[str, Any]]] = {
+        "default": compile_entry(merge_filter_configs(collect_manual_configs(filters, None, None, None)), movies)
+    }
+    for category in CATEGORY_CONFIG:
+        entries[f"category:{category['id']}"] = compile_entry(category_rules(filters, category), movies)
+
+    genre_ids = {str(category["genre_id"]) for category in CATEGORY_CONFIG}
+    genre_ids.update(key for key in filters if key.isdigit())
+    for genre_id in sorted(genre_ids, key=int):
+        rules = merge_filter_configs(collect_manual_configs(filters, None, [int(genre_id)], None))
+        entries[f"genre:{genre_id}"] = compile_entry(rules, movies)
+
+    return {
+        "version": COMPILED_FILTERS_VERSION,
+        "sourceHash": hash_text(source_text),
+        "datasetHash": dataset_fingerprint(movies),
+        "resolvedIds": sorted(str(movie["id"]) for movie in movies if movie.get("id") is not None),
+        "rules": entries,
+    }
+
+
+def load_dataset_movies() -> List[Dict[str, Any]]:
+    if not DATASET_PATH.exists():
+        return []
+    movies = json.loads(DATASET_PATH.read_text(encoding="utf-8"))
+    return movies if isinstance(movies, list) else []
+
+
+def read_compiled_filters() -> Optional[Dict[str, Any]]:
+    if not COMPILED_FILTERS_PATH.exists():
+        return None
+    return json.loads(COMPILED_FILTERS_PATH.read_text(encoding="utf-8"))
+
+
+def compiled_filters_problem(
+    compiled: Optional[Dict[str, Any]],
+    movies: List[Dict[str, Any]]
+) -> Optional[str]:
+    """Describe why the compiled artifact does not match the rules and dataset, if it does not."""
+    if compiled is None:
+        return f"{COMPILED_FILTERS_PATH} is missing"
+    if compiled.get("version") != COMPILED_FILTERS_VERSION:
+        return f"{COMPILED_FILTERS_PATH} has an unsupported version"
+    source_text = read_manual_filters_source()
+    if compiled.get("sourceHash") != hash_text(source_text):
+        return f"{COMPILED_FILTERS_PATH} is older than {MANUAL_FILTERS_PATH}"
+    if compiled.get("datasetHash") != dataset_fingerprint(movies):
+        return f"{COMPILED_FILTERS_PATH} was resolved against a different dataset"
+    return None
+
+
+def write_compiled_filters(movies: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """Compile and write the artifact; returns it with the rule keys whose rules changed."""
+    source_text = read_manual_filters_source()
+    compiled = compile_filters(source_text, movies)
+    previous = (read_compiled_filters() or {}).get("rules", {})
+
+    changed = []
+    for key, entry in compiled["rules"].items():
+        old = previous.get(key)
+        # Only the rule lists count as a change; blockedIds follow the dataset.
+        old_rules = {camel: old[camel] for _, camel in RULE_KEYS} if old else None
+        new_rules = {camel: entry[camel] for _, camel in RULE_KEYS} if entry else None
+        if old_rules != new_rules:
+            changed.append(key)
+
+    COMPILED_FILTERS_PATH.write_text(json.dumps(compiled, indent=2) + "\n", encoding="utf-8")
+    return compiled, changed
+
+
+def load_compiled_filters(movies: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """The compiled artifact, or an in-memory compile when it is missing or stale."""
+    movies = load_dataset_movies() if movies is None else movies
+    compiled = read_compiled_filters()
+    problem = compiled_filters_problem(compiled, movies)
+    if problem is None:
+        return compiled
+    print(f"Note: {problem}; compiling manual filters in memory (python -m dataset_tools filters).")
+    source_text = read_manual_filters_source()
+    return compile_filters(source_text, movies)
+
+
+class CompiledRules:
+    """One resolved rule entry: a set lookup for dataset movies, rule sets for the rest."""
+
+    def __init__(self, entry: Optional[Dict[str, Any]], resolved_ids: Set[str]) -> None:
+        self.resolved_ids = resolved_ids
+        self.blocked_ids: Set[str] = set(entry["blockedIds"]) if entry else set()
+        self.rules: Optional[Dict[str, Set[str]]] = (
+            {snake: set(entry[camel]) for snake, camel in RULE_KEYS} if entry else None
+        )
+
+    def is_filtered(self, movie: Dict[str, Any]) -> bool:
+        if self.rules is None:
+            return False
+        movie_id = movie.get("id")
+        id_str = str(movie_id).strip() if movie_id is not None else None
+        if id_str in self.resolved_ids:
+            return id_str in self.blocked_ids
+        return is_filtered_by_manual_rules(movie, self.rules)
+
+
+def compiled_category_rules(compiled: Dict[str, Any]) -> Dict[str, CompiledRules]:
+    resolved_ids = set(compiled.get("resolvedIds") or [])
+    entries = compiled.get("rules") or {}
+    return {
+        category["id"]: CompiledRules(entries.get(f"category:{category['id']}"), resolved_ids)
+        for category in CATEGORY_CONFIG
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    movies = load_dataset_movies()
+    compiled, changed = write_compiled_filters(movies)
+    blocked = sum(len(entry["blockedIds"]) for entry in compiled["rules"].values() if entry)
+    print(f"Compiled filters written to {COMPILED_FILTERS_PATH} "
+          f"({len(compiled['rules'])} entries, {blocked} blocked dataset ids).")
+    if not changed:
+        print("Rules unchanged.")
+        return
+    print(f"Changed rules: {', '.join(changed)}")
+    categories = [key.split(":", 1)[1] for key in changed if key.startswith("category:")]
+    if categories:
+        print(f"Rebuild the affected genres with: python -m dataset_tools build --categories {' '.join(categories)}")
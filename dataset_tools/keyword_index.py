@@ -0,0 +1,159 @@
+"""
+Build a keyword similarity index for the movies dataset so that round selection
+can keep very similar films out of the same row:
+- Every movie becomes a sparse TF-IDF vector over its TMDb keywords and genre IDs
+- Cosine similarity is computed with sparse matrix products over blocks of
+  rows, so memory stays linear in the number of movies
+- For each movie only its closest neighbours above a similarity floor are kept,
+  and every kept pair is listed from both sides so a one-sided check is enough
+- The neighbour lists are exported as compact JSON next to the dataset
+
+Usage:
+    1) pip install numpy scipy
+    2) python -m dataset_tools index
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .config import DATASET_PATH, KEYWORD_INDEX_PATH as INDEX_PATH
+
+INDEX_VERSION = 1
+MAX_NEIGHBOURS = 8
+MIN_SIMILARITY = 0.2
+GENRE_TERM_WEIGHT = 0.5  # genre IDs are shared widely; let keywords dominate
+# Shared genre terms make the similarity matrix nearly dense, so it is only ever
+# materialised for as many rows at a time as keep roughly this many cells.
+BLOCK_CELLS = 4_000_000
+
+
+def movie_terms(movie: Dict[str, Any]) -> Dict[str, float]:
+    terms: Dict[str, float] = {}
+    for keyword in movie.get("keywords") or []:
+        text = str(keyword or "").strip().lower()
+        if text:
+            terms[f"kw:{text}"] = 1.0
+    for gid in movie.get("genre_ids") or []:
+        if isinstance(gid, int):
+            terms[f"genre:{gid}"] = GENRE_TERM_WEIGHT
+    return terms
+
+
+def build_tfidf_matrix(movies: List[Dict[str, Any]]) -> Tuple[sparse.csr_matrix, List[str]]:
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    values: List[float] = []
+
+    for row, movie in enumerate(movies):
+        for term, weight in movie_terms(movie).items():
+            col = vocabulary.setdefault(term, len(vocabulary))
+            rows.append(row)
+            cols.append(col)
+            values.append(weight)
+
+    counts = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (rows, cols)),
+        shape=(len(movies), len(vocabulary)),
+    )
+
+    # Smoothed IDF, so a term used by every movie still carries a little weight.
+    doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1.0 + len(movies)) / (1.0 + doc_freq)) + 1.0
+    tfidf = counts @ sparse.diags(idf.astype(np.float32))
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    tfidf = sparse.diags(1.0 / norms) @ tfidf
+
+    terms = [""] * len(vocabulary)
+    for term, col in vocabulary.items():
+        terms[col] = term
+    return tfidf.tocsr(), terms
+
+
+def nearest_neighbours(
+    tfidf: sparse.csr_matrix,
+    max_neighbours: int,
+    min_similarity: float
+) -> List[List[Tuple[int, float]]]:
+    count = tfidf.shape[0]
+    block_rows = max(1, BLOCK_CELLS // max(count, 1))
+    transposed = tfidf.T.tocsc()
+
+    neighbours: List[List[Tuple[int, float]]] = []
+    for block_start in range(0, count, block_rows):
+        block_end = min(block_start + block_rows, count)
+        similarity = (tfidf[block_start:block_end] @ transposed).tocsr()
+        for offset in range(block_end - block_start):
+            row = block_start + offset
+            start, end = similarity.indptr[offset], similarity.indptr[offset + 1]
+            cols = similarity.indices[start:end]
+            sims = similarity.data[start:end]
+            keep = (sims >= min_similarity) & (cols != row)
+            cols, sims = cols[keep], sims[keep]
+            if len(sims) > max_neighbours:
+                top = np.argpartition(-sims, max_neighbours - 1)[:max_neighbours]
+                cols, sims = cols[top], sims[top]
+            order = np.argsort(-sims, kind="stable")
+            neighbours.append([(int(cols[i]), float(sims[i])) for i in order])
+    return neighbours
+
+
+def symmetric_neighbours(neighbours: List[List[Tuple[int, float]]]) -> List[List[Tuple[int, float]]]:
+    """Add each kept pair to the other movie's list too; own neighbours stay first."""
+    reverse: List[List[Tuple[int, float]]] = [[] for _ in neighbours]
+    for row, pairs in enumerate(neighbours):
+        for col, similarity in pairs:
+            reverse[col].append((row, similarity))
+    merged: List[List[Tuple[int, float]]] = []
+    for row, pairs in enumerate(neighbours):
+        own = {col for col, _ in pairs}
+        extra = sorted((pair for pair in reverse[row] if pair[0] not in own), key=lambda pair: -pair[1])
+        merged.append(pairs + extra)
+    return merged
+
+
+def write_keyword_index(
+    movies: List[Dict[str, Any]]
+) -> Tuple[List[List[Tuple[int, float]]], sparse.csr_matrix, List[str]]:
+    movies = [movie for movie in movies if movie.get("id") is not None]
+    tfidf, terms = build_tfidf_matrix(movies)
+    neighbours = symmetric_neighbours(nearest_neighbours(tfidf, MAX_NEIGHBOURS, MIN_SIMILARITY))
+
+    ids = [str(movie["id"]) for movie in movies]
+    index = {
+        "version": INDEX_VERSION,
+        "maxNeighbours": MAX_NEIGHBOURS,
+        "minSimilarity": MIN_SIMILARITY,
+        "neighbours": {
+            ids[row]: [ids[col] for col, _ in pairs]
+            for row, pairs in enumerate(neighbours)
+            if pairs
+        },
+    }
+    INDEX_PATH.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    return neighbours, tfidf, terms
+
+
+def run(args: argparse.Namespace) -> None:
+    if not DATASET_PATH.exists():
+        raise SystemExit(f"Dataset not found at {DATASET_PATH}")
+
+    movies = json.loads(DATASET_PATH.read_text(encoding="utf-8"))
+    if not isinstance(movies, list):
+        raise SystemExit("Dataset is not a list.")
+    neighbours, tfidf, terms = write_keyword_index(movies)
+
+    print(f"Vocabulary: {len(terms)} terms, matrix density {tfidf.nnz / max(np.prod(tfidf.shape), 1):.4f}")
+    linked = sum(1 for pairs in neighbours if pairs)
+    mean_degree = sum(len(pairs) for pairs in neighbours) / max(len(neighbours), 1)
+    print(f"{linked}/{len(neighbours)} movies have neighbours (mean {mean_degree:.2f}).")
+    print(f"Keyword index written to {INDEX_PATH}.")
+
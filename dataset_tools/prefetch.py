@@ -0,0 +1,93 @@
+"""
+Discover pages fetched ahead of candidate validation.
+
+Up to `depth` pages are requested concurrently on a small thread pool while the
+caller validates the candidates of earlier pages, so paging and validation
+overlap and pages arrive in order from a bounded window. The depth adapts to
+each page's yield (how many of its candidates needed validation): pages that
+are mostly skipped are drained quickly and need a deeper window, pages that
+keep validation busy need only one page ahead. The window is also capped at
+the pages the remaining quota is expected to need, given the movies accepted
+per page so far, so little is fetched past the quota. Closing the prefetcher
+cancels the pages that have not been requested yet and does not wait for the
+ones in flight.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from .config import (
+    PREFETCH_MAX_PAGES,
+    PREFETCH_MIN_PAGES,
+    PREFETCH_WORK_AHEAD,
+    PREFETCH_YIELD_SMOOTHING,
+)
+
+
+class PagePrefetcher:
+    def __init__(
+        self,
+        fetch: Callable[[int], Dict[str, Any]],
+        min_depth: int = PREFETCH_MIN_PAGES,
+        max_depth: int = PREFETCH_MAX_PAGES,
+        work_ahead: float = PREFETCH_WORK_AHEAD,
+        smoothing: float = PREFETCH_YIELD_SMOOTHING
+    ) -> None:
+        self.fetch = fetch
+        self.min_depth = max(min_depth, 1)
+        self.max_depth = max(max_depth, self.min_depth)
+        self.work_ahead = work_ahead
+        self.smoothing = smoothing
+        self.depth = self.min_depth
+        self.average_yield: Optional[float] = None
+        self.average_accepted: Optional[float] = None
+        self.pending_pages: Iterator[int] = iter(())
+        self.window: Deque[Tuple[int, Future]] = deque()
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self, pages: Iterable[int]) -> None:
+        self.pending_pages = iter(pages)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_depth, thread_name_prefix="discover")
+        self._fill()
+
+    def _fill(self) -> None:
+        while self.executor is not None and len(self.window) < self.depth:
+            page = next(self.pending_pages, None)
+            if page is None:
+                return
+            self.window.append((page, self.executor.submit(self.fetch, page)))
+
+    def __iter__(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        while self.window:
+            page, future = self.window.popleft()
+            # Request the next page before waiting, so the window never runs dry.
+            self._fill()
+            yield page, future.result()
+
+    def record_yield(self, validated: int, accepted: int, remaining: int) -> None:
+        """Report the page just consumed: candidates validated, movies accepted, and movies still needed."""
+        self.average_yield = self._smooth(self.average_yield, validated)
+        self.average_accepted = self._smooth(self.average_accepted, accepted)
+        per_page = max(self.average_yield, self.work_ahead / self.max_depth)
+        depth = math.ceil(self.work_ahead / per_page)
+        if self.average_accepted > 0:
+            depth = min(depth, math.ceil(remaining / self.average_accepted))
+        self.depth = min(max(depth, self.min_depth), self.max_depth)
+        self._fill()
+
+    def _smooth(self, average: Optional[float], value: int) -> float:
+        if average is None:
+            return float(value)
+        return average + self.smoothing * (value - average)
+
+    def close(self) -> None:
+        """Cancel outstanding prefetches; pages already in flight are left to finish and discarded."""
+        self.pending_pages = iter(())
+        self.window.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
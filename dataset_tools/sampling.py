@@ -0,0 +1,166 @@
+"""
+Bounded stratified sampling of discover candidates while they stream past.
+
+Each genre's target is split over strata (release-year band x popularity
+quantile). Candidates for a stratum that still has room are validated and
+kept; everything else goes into a fixed-size reservoir (Algorithm R) that is
+only drawn from if some strata cannot be filled. A stratum whose candidates
+keep failing validation is closed so it stops costing requests, and its unfilled
+quota moves to the strata still open. Once every stratum is full or closed the
+caller tops up from the reservoir and then from the pages that follow, so a
+short genre costs extra pages rather than a failed build. Memory stays at
+target rows plus the reservoir however many pages are scanned.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import (
+    SAMPLING_MAX_REJECTIONS,
+    SAMPLING_POPULARITY_BANDS,
+    SAMPLING_RESERVOIR_SIZE,
+    SAMPLING_YEAR_BANDS,
+)
+
+Stratum = Tuple[int, int]
+YearBand = Tuple[Optional[int], Optional[int]]
+
+
+def year_band_label(band: YearBand) -> str:
+    low, high = band
+    if low is None and high is None:
+        return "any year"
+    if low is None:
+        return f"≤{high}"
+    if high is None:
+        return f"≥{low}"
+    return f"{low}–{high}"
+
+
+class StratifiedSampler:
+    def __init__(
+        self,
+        target: int,
+        year_bands: Sequence[YearBand] = SAMPLING_YEAR_BANDS,
+        popularity_bands: int = SAMPLING_POPULARITY_BANDS,
+        reservoir_size: int = SAMPLING_RESERVOIR_SIZE,
+        max_rejections: Optional[int] = SAMPLING_MAX_REJECTIONS,
+        rng: Optional[random.Random] = None
+    ) -> None:
+        self.target = target
+        self.year_bands = list(year_bands)
+        self.popularity_bands = max(popularity_bands, 1)
+        self.reservoir_size = reservoir_size
+        self.max_rejections = max_rejections
+        self.rng = rng or random.Random()
+
+        strata = [
+            (year_index, popularity_index)
+            for year_index in range(len(self.year_bands))
+            for popularity_index in range(self.popularity_bands)
+        ]
+        base, remainder = divmod(target, len(strata))
+        # Hand the remainder to random strata so no band is favoured systematically.
+        extra = set(self.rng.sample(strata, remainder))
+        self.quotas: Dict[Stratum, int] = {
+            stratum: base + (1 if stratum in extra else 0) for stratum in strata
+        }
+        self.rows: Dict[Stratum, List[Dict[str, Any]]] = {stratum: [] for stratum in strata}
+        self.rejections: Dict[Stratum, int] = {stratum: 0 for stratum in strata}
+        self.closed: set[Stratum] = set()
+        self.fallback_rows: List[Dict[str, Any]] = []
+        self.reservoir: List[Dict[str, Any]] = []
+        self.overflow_seen = 0
+
+    def stratum(self, year: Optional[int], popularity_quantile: float) -> Optional[Stratum]:
+        popularity_index = min(int(popularity_quantile * self.popularity_bands), self.popularity_bands - 1)
+        for year_index, (low, high) in enumerate(self.year_bands):
+            if low is None and high is None:
+                return year_index, popularity_index
+            if year is None:
+                continue
+            if (low is None or year >= low) and (high is None or year <= high):
+                return year_index, popularity_index
+        return None
+
+    def wants(self, stratum: Optional[Stratum]) -> bool:
+        return (
+            stratum is not None
+            and stratum not in self.closed
+            and len(self.rows[stratum]) < self.quotas[stratum]
+        )
+
+    def add(self, stratum: Stratum, row: Dict[str, Any]) -> None:
+        self.rows[stratum].append(row)
+        self.rejections[stratum] = 0
+
+    def reject(self, stratum: Stratum) -> None:
+        self.rejections[stratum] += 1
+        if self.max_rejections is not None and self.rejections[stratum] >= self.max_rejections:
+            self.close(stratum)
+
+    def close(self, stratum: Stratum) -> None:
+        """Stop validating for a stratum and hand its unfilled quota to the open ones."""
+        self.closed.add(stratum)
+        freed = self.quotas[stratum] - len(self.rows[stratum])
+        self.quotas[stratum] = len(self.rows[stratum])
+        open_strata = [other for other in self.quotas if other not in self.closed]
+        if freed <= 0 or not open_strata:
+            return
+        base, remainder = divmod(freed, len(open_strata))
+        extra = set(self.rng.sample(open_strata, remainder))
+        for other in open_strata:
+            self.quotas[other] += base + (1 if other in extra else 0)
+
+    def offer(self, candidate: Dict[str, Any]) -> None:
+        """Keep a uniform sample of candidates that were not needed for their stratum."""
+        self.overflow_seen += 1
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(candidate)
+            return
+        slot = self.rng.randrange(self.overflow_seen)
+        if slot < self.reservoir_size:
+            self.reservoir[slot] = candidate
+
+    def add_fallback(self, row: Dict[str, Any]) -> None:
+        self.fallback_rows.append(row)
+
+    @property
+    def collected(self) -> int:
+        return sum(len(rows) for rows in self.rows.values()) + len(self.fallback_rows)
+
+    @property
+    def complete(self) -> bool:
+        return self.collected >= self.target
+
+    @property
+    def strata_done(self) -> bool:
+        """Every stratum is full or closed; anything still missing comes from fallback rows."""
+        return all(
+            stratum in self.closed or len(rows) >= self.quotas[stratum]
+            for stratum, rows in self.rows.items()
+        )
+
+    def drain_reservoir(self) -> List[Dict[str, Any]]:
+        candidates = self.reservoir
+        self.reservoir = []
+        self.rng.shuffle(candidates)
+        return candidates
+
+    def sample(self) -> List[Dict[str, Any]]:
+        rows = [row for stratum_rows in self.rows.values() for row in stratum_rows]
+        return rows + self.fallback_rows
+
+    def summary(self) -> str:
+        parts = []
+        for year_index, band in enumerate(self.year_bands):
+            counts = "/".join(
+                f"{len(self.rows[(year_index, p)])}:{self.quotas[(year_index, p)]}"
+                for p in range(self.popularity_bands)
+            )
+            parts.append(f"{year_band_label(band)} {counts}")
+        if self.fallback_rows:
+            parts.append(f"fallback {len(self.fallback_rows)}")
+        return "; ".join(parts)
@@ -0,0 +1,254 @@
+"""
+Simulate how the experiment rounds expose movies, genres and adjectives across
+many participants, before a study is launched:
+- Mirrors buildExperimentRounds in src/utils/experimentRoundsCache.js: shuffled
+  conditions, shuffled genre pools consumed in order, keyword-less movies
+  skipped in adjective rounds, adjectives assigned by a running cursor
+- Participants are sampled in NumPy batches, so 100k+ runs take seconds
+- Reports exposure counts and their spread per movie, condition, round and
+  adjective, plus within-row co-occurrence of movies
+
+The keyword-diversity deferral of the browser build is not modelled; it only
+moves near-duplicate movies to a later round.
+
+Usage:
+    1) pip install numpy
+    2) python -m dataset_tools simulate --participants 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import ADJECTIVES, CATEGORY_CONFIG, EXPERIMENT_CONDITIONS
+from .filters import compiled_category_rules, load_compiled_filters
+
+
+def build_category_pools(movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Static part of the browser selection: genre, artwork, genre ID and manual rules."""
+    category_filters = compiled_category_rules(load_compiled_filters(movies))
+    pools = []
+    for category in CATEGORY_CONFIG:
+        filter_rules = category_filters[category["id"]]
+        indices = [
+            index for index, movie in enumerate(movies)
+            if (movie.get("genre") or "").lower() == category["label"].lower()
+            and (movie.get("backdrop_path") or movie.get("poster_path"))
+            and category["genre_id"] in (movie.get("genre_ids") or [])
+            and not filter_rules.is_filtered(movie)
+        ]
+        pools.append({
+            "id": category["id"],
+            "label": category["label"],
+            "movie_indices": np.asarray(indices, dtype=np.int64),
+            "has_keywords": np.asarray(
+                [bool(movies[index].get("keywords")) for index in indices], dtype=bool
+            ),
+        })
+    return pools
+
+
+def simulate(
+    movies: List[Dict[str, Any]],
+    participants: int,
+    rounds_count: int,
+    movies_per_category: int,
+    adjectives: List[str],
+    batch_size: int,
+    seed: Optional[int]
+) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    pools = build_category_pools(movies)
+    adjectives = adjectives or ["Recommended"]
+
+    n_movies = len(movies)
+    n_conditions = len(EXPERIMENT_CONDITIONS)
+    n_categories = len(pools)
+    n_adjectives = len(adjectives)
+    n_rounds = min(rounds_count, n_conditions)
+    uses_adjectives = np.asarray([c["useAdjectives"] for c in EXPERIMENT_CONDITIONS], dtype=bool)
+
+    # The adjective cursor advances once per selected movie, in round/category/slot
+    # order, so each slot always receives the same adjective.
+    slot_adjective = (
+        np.arange(n_rounds * n_categories * movies_per_category)
+        .reshape(n_rounds, n_categories, movies_per_category) % n_adjectives
+    )
+
+    exposure_by_condition = np.zeros((n_movies, n_conditions), dtype=np.int64)
+    exposure_by_round = np.zeros((n_movies, n_rounds), dtype=np.int64)
+    exposure_by_adjective = np.zeros((n_movies, n_adjectives), dtype=np.int64)
+    co_occurrence = [
+        np.zeros((len(pool["movie_indices"]),) * 2, dtype=np.float64) for pool in pools
+    ]
+    failed = 0
+
+    for start in range(0, participants, batch_size):
+        size = min(batch_size, participants - start)
+        conditions = np.argsort(rng.random((size, n_conditions)), axis=1)[:, :n_rounds]
+        needs_keywords = uses_adjectives[conditions]
+        ok = np.ones(size, dtype=bool)
+        # Per category: (size, rounds, slots) positions into the category pool.
+        picks = []
+
+        for pool in pools:
+            pool_size = len(pool["movie_indices"])
+            order = np.argsort(rng.random((size, pool_size)), axis=1)
+            has_keywords = pool["has_keywords"][order]
+            positions = np.arange(pool_size)
+            cursor = np.zeros(size, dtype=np.int64)
+            slots = np.zeros((size, n_rounds, movies_per_category), dtype=np.int64)
+            picks.append(slots)
+            if pool_size < movies_per_category:
+                ok[:] = False
+                continue
+
+            for round_index in range(n_rounds):
+                eligible = (positions >= cursor[:, None]) & (
+                    has_keywords | ~needs_keywords[:, round_index, None]
+                )
+                taken = np.cumsum(eligible, axis=1)
+                enough = taken[:, -1] >= movies_per_category
+                ok &= enough
+                chosen = eligible & (taken <= movies_per_category) & enough[:, None]
+                rows, cols = np.nonzero(chosen)
+                slots[enough, round_index] = order[rows, cols].reshape(-1, movies_per_category)
+                cursor = np.where(
+                    enough, np.argmax(taken >= movies_per_category, axis=1) + 1, pool_size
+                )
+
+        failed += int((~ok).sum())
+        if not ok.any():
+            continue
+        batch_conditions = conditions[ok]
+        batch_rounds = np.broadcast_to(np.arange(n_rounds), batch_conditions.shape)
+
+        for category_index, (pool, slots) in enumerate(zip(pools, picks)):
+            slots = slots[ok]
+            movie_ids = pool["movie_indices"][slots]
+            slot_conditions = np.broadcast_to(batch_conditions[:, :, None], slots.shape)
+            slot_rounds = np.broadcast_to(batch_rounds[:, :, None], slots.shape)
+
+            exposure_by_condition += np.bincount(
+                (movie_ids * n_conditions + slot_conditions).ravel(),
+                minlength=n_movies * n_conditions
+            ).reshape(n_movies, n_conditions)
+            exposure_by_round += np.bincount(
+                (movie_ids * n_rounds + slot_rounds).ravel(),
+                minlength=n_movies * n_rounds
+            ).reshape(n_movies, n_rounds)
+
+            shown = uses_adjectives[slot_conditions]
+            adjective_ids = np.broadcast_to(slot_adjective[None, :, category_index, :], slots.shape)
+            exposure_by_adjective += np.bincount(
+                (movie_ids[shown] * n_adjectives + adjective_ids[shown]),
+                minlength=n_movies * n_adjectives
+            ).reshape(n_movies, n_adjectives)
+
+            # One indicator row per (participant, round) category row.
+            rows = slots.reshape(-1, movies_per_category)
+            indicator = np.zeros((len(rows), len(pool["movie_indices"])), dtype=np.float32)
+            np.put_along_axis(indicator, rows, 1.0, axis=1)
+            co_occurrence[category_index] += indicator.T @ indicator
+
+    return {
+        "participants": participants,
+        "failed": failed,
+        "pools": pools,
+        "adjectives": adjectives,
+        "exposure_by_condition": exposure_by_condition,
+        "exposure_by_round": exposure_by_round,
+        "exposure_by_adjective": exposure_by_adjective,
+        "co_occurrence": co_occurrence,
+    }
+
+
+def spread(counts: np.ndarray) -> str:
+    counts = np.asarray(counts, dtype=np.float64)
+    mean = counts.mean()
+    cv = counts.std() / mean if mean else 0.0
+    return (f"mean {mean:10.1f}  var {counts.var():12.1f}  cv {cv:6.3f}  "
+            f"min {counts.min():>8.0f}  max {counts.max():>8.0f}")
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    by_condition = result["exposure_by_condition"]
+    by_round = result["exposure_by_round"]
+    by_adjective = result["exposure_by_adjective"]
+    completed = result["participants"] - result["failed"]
+
+    print(f"Participants: {result['participants']} simulated, {result['failed']} could not be "
+          f"assigned full rounds")
+    for pool, co_occurrence in zip(result["pools"], result["co_occurrence"]):
+        indices = pool["movie_indices"]
+        if not len(indices):
+            print(f"\n{pool['label']}: no eligible movies")
+            continue
+        exposure = by_condition[indices].sum(axis=1)
+        pairs = co_occurrence[~np.eye(len(indices), dtype=bool)]
+        print(f"\n{pool['label']} ({len(indices)} eligible movies)")
+        print(f"  exposure per movie        {spread(exposure)}")
+        print(f"  movie x condition         {spread(by_condition[indices])}")
+        print(f"  movie x round             {spread(by_round[indices])}")
+        print(f"  movie x adjective         {spread(by_adjective[indices])}")
+        print(f"  pair co-occurrence in row {spread(pairs)}")
+        never = int((exposure == 0).sum())
+        if never:
+            print(f"  {never} movies were never shown")
+
+    print("\nExposures per condition:")
+    for index, condition in enumerate(EXPERIMENT_CONDITIONS):
+        print(f"  {condition['id']}  {int(by_condition[:, index].sum()):>12}")
+
+    print("\nAdjective exposures:")
+    print(f"  {spread(by_adjective.sum(axis=0))}")
+    if completed:
+        print(f"  per participant: {by_adjective.sum() / completed:.1f} adjective labels")
+
+
+def save_result(result: Dict[str, Any], movies: List[Dict[str, Any]], path: Path) -> None:
+    arrays = {
+        "movie_ids": np.asarray([movie.get("id") or -1 for movie in movies], dtype=np.int64),
+        "condition_ids": np.asarray([c["id"] for c in EXPERIMENT_CONDITIONS]),
+        "adjectives": np.asarray(result["adjectives"]),
+        "exposure_by_condition": result["exposure_by_condition"],
+        "exposure_by_round": result["exposure_by_round"],
+        "exposure_by_adjective": result["exposure_by_adjective"],
+    }
+    for pool, co_occurrence in zip(result["pools"], result["co_occurrence"]):
+        arrays[f"{pool['id']}_movie_indices"] = pool["movie_indices"]
+        arrays[f"{pool['id']}_co_occurrence"] = co_occurrence
+    np.savez_compressed(path, **arrays)
+
+
+def run(args: argparse.Namespace) -> None:
+    if not args.dataset.exists():
+        raise SystemExit(f"Dataset not found at {args.dataset}")
+    movies = json.loads(args.dataset.read_text(encoding="utf-8"))
+    if not isinstance(movies, list):
+        raise SystemExit("Dataset is not a list.")
+
+    started = time.perf_counter()
+    result = simulate(
+        movies,
+        participants=args.participants,
+        rounds_count=args.rounds,
+        movies_per_category=args.movies_per_category,
+        adjectives=ADJECTIVES[:max(args.adjectives, 0)],
+        batch_size=max(args.batch_size, 1),
+        seed=args.seed
+    )
+    elapsed = time.perf_counter() - started
+
+    print_report(result)
+    if args.output:
+        save_result(result, movies, args.output)
+        print(f"\nMatrices written to {args.output}")
+    print(f"\nSimulated in {elapsed:.1f}s")
+
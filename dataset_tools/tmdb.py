@@ -0,0 +1,133 @@
+"""
+Shared TMDb HTTP client: one pooled keep-alive session with gzip, retries and
+request pacing (shared by every thread using the client), plus the
+trailer-picking rules used by every builder.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    API_BASE,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    REQUEST_ATTEMPTS,
+    REQUEST_DELAY_SECONDS,
+    REQUEST_TIMEOUT_SECONDS,
+)
+
+
+def load_api_key() -> str:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    api_key = os.getenv("TMDB_API_KEY")
+    if not api_key:
+        raise SystemExit("TMDB_API_KEY is not set; please provide it in the environment or .env file.")
+    return api_key
+
+
+def create_session(api_key: Optional[str] = None) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    if api_key:
+        session.params = {"api_key": api_key}
+    return session
+
+
+class TMDbClient:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        delay: float = REQUEST_DELAY_SECONDS,
+        attempts: int = REQUEST_ATTEMPTS,
+        api_base: str = API_BASE
+    ) -> None:
+        self.session = create_session(api_key if api_key is not None else load_api_key())
+        self.delay = delay
+        self.attempts = attempts
+        self.api_base = api_base
+        self.pace_lock = threading.Lock()
+        self.next_request_at = 0.0
+
+    def wait_for_slot(self) -> None:
+        """Start requests at least `delay` apart, whichever thread makes them."""
+        with self.pace_lock:
+            now = time.monotonic()
+            start = max(now, self.next_request_at)
+            self.next_request_at = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def back_off(self, seconds: float) -> None:
+        """Hold back every thread's next request, not only this one's, after a rate-limit response."""
+        with self.pace_lock:
+            self.next_request_at = max(self.next_request_at, time.monotonic() + seconds)
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        url = f"{self.api_base}{path}"
+        params = params or {}
+
+        for attempt in range(self.attempts):
+            self.wait_for_slot()
+            try:
+                response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+                if response.status_code == 429:
+                    self.back_off(1.5 * (attempt + 1))
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except requests.RequestException:
+                if attempt == self.attempts - 1:
+                    raise
+                time.sleep(1.5 * (attempt + 1))
+        return {}
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def trailer_score(video: Dict[str, Any]) -> tuple[int, int]:
+    # Prefer Trailer over Teaser; prefer official
+    video_type = (video.get("type") or "").lower()
+    type_score = 2 if video_type == "trailer" else (1 if video_type == "teaser" else 0)
+    official_score = 1 if video.get("official") else 0
+    return type_score, official_score
+
+
+def youtube_url(key: str) -> str:
+    return f"https://www.youtube.com/watch?v={key}"
+
+
+def ranked_trailer_urls(videos: Iterable[Dict[str, Any]]) -> List[str]:
+    """YouTube URLs from best to worst by trailer_score; ties keep TMDb's order."""
+    candidates: List[Dict[str, Any]] = [
+        v for v in videos
+        if (v.get("site") == "YouTube") and v.get("key")
+    ]
+    candidates.sort(key=trailer_score, reverse=True)
+    urls: List[str] = []
+    for video in candidates:
+        url = youtube_url(video["key"])
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def pick_trailer_url(videos: Iterable[Dict[str, Any]]) -> Optional[str]:
+    urls = ranked_trailer_urls(videos)
+    return urls[0] if urls else None
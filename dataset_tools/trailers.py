@@ -0,0 +1,180 @@
+"""
+Check that the dataset's YouTube trailers can still be played:
+- Every youtube_trailer_url is looked up concurrently against an oEmbed-style
+  endpoint (YouTube's by default; pass --endpoint to use a local stand-in)
+- Results are cached with a TTL, so repeated runs only re-check stale entries
+- With --fix, a movie whose trailer is gone gets the next-best TMDb video by
+  the usual trailer/teaser/official ranking, and the dataset is rewritten
+
+Usage:
+    python -m dataset_tools trailers
+    python -m dataset_tools trailers --fix
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from .config import (
+    DATASET_PATH,
+    OEMBED_ENDPOINT,
+    PARQUET_PATH,
+    REQUEST_TIMEOUT_SECONDS,
+    TRAILER_CHECK_TTL_SECONDS,
+    TRAILER_CHECK_WORKERS,
+    TRAILER_CHECKS_PATH,
+)
+from .export import publish_dataset, read_dataset
+from .tmdb import TMDbClient, create_session, ranked_trailer_urls
+
+# oEmbed answers these for removed, private and non-embeddable videos; anything
+# else (timeouts, 5xx, 429) leaves the trailer's status unknown.
+UNAVAILABLE_STATUSES = {400, 401, 403, 404}
+
+
+class TrailerCheckCache:
+    def __init__(self, path: Path = TRAILER_CHECKS_PATH, ttl: float = TRAILER_CHECK_TTL_SECONDS) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            self.entries = json.loads(path.read_text(encoding="utf-8")).get("checks", {})
+
+    def get(self, url: str, now: float) -> Optional[bool]:
+        entry = self.entries.get(url)
+        if not entry or now - entry.get("checked", 0) > self.ttl:
+            return None
+        return bool(entry.get("available"))
+
+    def set(self, url: str, available: bool, now: float) -> None:
+        self.entries[url] = {"available": available, "checked": now}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"checks": self.entries}, separators=(",", ":")), encoding="utf-8")
+
+
+def check_trailer(session: requests.Session, endpoint: str, url: str) -> Optional[bool]:
+    try:
+        response = session.get(endpoint, params={"url": url, "format": "json"}, timeout=REQUEST_TIMEOUT_SECONDS)
+    except requests.RequestException:
+        return None
+    if response.status_code in UNAVAILABLE_STATUSES:
+        return False
+    if response.status_code != 200:
+        return None
+    try:
+        return bool(response.json().get("title"))
+    except ValueError:
+        return None
+
+
+def check_trailers(
+    urls: Iterable[str],
+    cache: TrailerCheckCache,
+    endpoint: str = OEMBED_ENDPOINT,
+    workers: int = TRAILER_CHECK_WORKERS
+) -> Dict[str, Optional[bool]]:
+    """Availability per URL: True, False, or None when the check was inconclusive."""
+    now = time.time()
+    results: Dict[str, Optional[bool]] = {}
+    pending: List[str] = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get(url, now)
+        if cached is None:
+            pending.append(url)
+        else:
+            results[url] = cached
+    if not pending:
+        return results
+
+    session = create_session()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            checked = executor.map(lambda url: check_trailer(session, endpoint, url), pending)
+            for url, available in zip(pending, checked):
+                results[url] = available
+                if available is not None:
+                    cache.set(url, available, now)
+    finally:
+        session.close()
+    return results
+
+
+def find_replacements(
+    client: TMDbClient,
+    movies: List[Dict[str, Any]],
+    cache: TrailerCheckCache,
+    endpoint: str,
+    workers: int
+) -> Dict[int, str]:
+    """Best available alternative trailer per movie id, for movies that have one."""
+    alternatives: Dict[int, List[str]] = {}
+    for movie in movies:
+        videos = client.get_json(f"/movie/{movie['id']}/videos").get("results") or []
+        alternatives[movie["id"]] = [
+            url for url in ranked_trailer_urls(videos) if url != movie.get("youtube_trailer_url")
+        ]
+
+    # One concurrent batch for every candidate; each movie then takes its best available one.
+    availability = check_trailers(
+        (url for urls in alternatives.values() for url in urls), cache, endpoint, workers
+    )
+    replacements: Dict[int, str] = {}
+    for movie_id, urls in alternatives.items():
+        for url in urls:
+            if availability.get(url):
+                replacements[movie_id] = url
+                break
+    return replacements
+
+
+def run(args: argparse.Namespace) -> None:
+    table = read_dataset(PARQUET_PATH)
+    movies = table.to_pylist()
+    cache = TrailerCheckCache(ttl=args.ttl)
+
+    missing = [movie for movie in movies if not movie.get("youtube_trailer_url")]
+    availability = check_trailers(
+        (movie["youtube_trailer_url"] for movie in movies if movie.get("youtube_trailer_url")),
+        cache,
+        args.endpoint,
+        args.workers
+    )
+    unavailable = [movie for movie in movies if availability.get(movie.get("youtube_trailer_url") or "") is False]
+    unknown = sum(1 for available in availability.values() if available is None)
+    print(f"{len(availability)} trailers checked: {len(unavailable)} unavailable, {unknown} inconclusive.")
+    if missing:
+        print(f"{len(missing)} movies have no trailer: "
+              + ", ".join(f"{movie['id']} ({movie.get('title') or 'untitled'})" for movie in missing))
+
+    replacements: Dict[int, str] = {}
+    if unavailable and args.fix:
+        client = TMDbClient()
+        try:
+            replacements = find_replacements(client, unavailable, cache, args.endpoint, args.workers)
+        finally:
+            client.close()
+    cache.save()
+
+    for movie in unavailable:
+        label = f"{movie['id']} ({movie.get('title') or 'untitled'})"
+        replacement = replacements.get(movie["id"])
+        if replacement:
+            print(f"  {label}: {movie['youtube_trailer_url']} -> {replacement}")
+        else:
+            print(f"  {label}: {movie['youtube_trailer_url']} unavailable" + (", no alternative" if args.fix else ""))
+
+    if replacements:
+        for movie in movies:
+            if movie["id"] in replacements:
+                movie["youtube_trailer_url"] = replacements[movie["id"]]
+        publish_dataset(movies)
+        print(f"Replaced {len(replacements)} trailers in {PARQUET_PATH} and {DATASET_PATH}.")
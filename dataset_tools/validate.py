@@ -0,0 +1,120 @@
+"""
+Check the dataset the app loads without touching the network:
+- Every movie has a unique TMDb id, a focus genre, artwork and a YouTube trailer
+- The focus genre is in the movie's genre_ids and keywords are present
+- Each genre holds the target number of movies
+- No movie breaks the manual include/exclude rules, and the compiled rules
+  artifact matches both the rules and the dataset
+- The keyword neighbour index only references movies in the dataset
+- The app's JSON matches the canonical Parquet dataset it is exported from
+
+Usage:
+    python -m dataset_tools validate
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .config import CATEGORY_CONFIG, DATASET_PATH, KEYWORD_INDEX_PATH, PARQUET_PATH
+from .filters import (
+    compile_filters,
+    compiled_category_rules,
+    compiled_filters_problem,
+    read_compiled_filters,
+    read_manual_filters_source,
+)
+
+YOUTUBE_URL_PATTERN = re.compile(r"^https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]{6,}$")
+
+
+def validate_movies(movies: List[Dict[str, Any]], target: int) -> List[str]:
+    problems: List[str] = []
+    categories = {category["label"]: category for category in CATEGORY_CONFIG}
+    compiled = read_compiled_filters()
+    problem = compiled_filters_problem(compiled, movies)
+    if problem:
+        problems.append(f"{problem}; run python -m dataset_tools filters")
+    # Check the movies against the source rules, whatever state the artifact is in.
+    rules_by_id = compiled_category_rules(compile_filters(read_manual_filters_source(), movies))
+    category_filters = {category["label"]: rules_by_id[category["id"]] for category in CATEGORY_CONFIG}
+
+    ids = Counter(movie.get("id") for movie in movies)
+    for movie_id, count in ids.items():
+        if movie_id is None:
+            problems.append(f"{count} movies have no id")
+        elif count > 1:
+            problems.append(f"id {movie_id} appears {count} times")
+
+    for movie in movies:
+        label = f"{movie.get('id')} ({movie.get('title') or 'untitled'})"
+        genre = movie.get("genre")
+        category = categories.get(genre)
+        if not category:
+            problems.append(f"{label}: unexpected genre {genre!r}")
+        elif category["genre_id"] not in (movie.get("genre_ids") or []):
+            problems.append(f"{label}: genre_ids do not include {genre} ({category['genre_id']})")
+        if not YOUTUBE_URL_PATTERN.match(movie.get("youtube_trailer_url") or ""):
+            problems.append(f"{label}: missing or malformed youtube_trailer_url")
+        if not (movie.get("backdrop_path") or movie.get("poster_path")):
+            problems.append(f"{label}: no poster or backdrop")
+        if not movie.get("keywords"):
+            problems.append(f"{label}: no keywords")
+        if category and category_filters[genre].is_filtered(movie):
+            problems.append(f"{label}: excluded by manual rules for {genre}")
+
+    counts = Counter(movie.get("genre") for movie in movies)
+    for genre in categories:
+        if counts.get(genre, 0) != target:
+            problems.append(f"{genre}: {counts.get(genre, 0)} movies, expected {target}")
+
+    if KEYWORD_INDEX_PATH.exists():
+        index = json.loads(KEYWORD_INDEX_PATH.read_text(encoding="utf-8"))
+        known = {str(movie_id) for movie_id in ids}
+        referenced = set(index.get("neighbours", {}))
+        for neighbours in index.get("neighbours", {}).values():
+            referenced.update(neighbours)
+        stale = referenced - known
+        if stale:
+            problems.append(f"{KEYWORD_INDEX_PATH}: {len(stale)} ids not in the dataset; rerun the index command")
+
+    return problems
+
+
+def parquet_mismatch(movies: List[Dict[str, Any]]) -> Optional[str]:
+    if not PARQUET_PATH.exists():
+        return None
+    from .export import load_rows
+
+    canonical = load_rows(PARQUET_PATH)
+    if canonical == movies:
+        return None
+    by_id = {movie.get("id"): movie for movie in movies}
+    canonical_ids = {row.get("id") for row in canonical}
+    differing = sum(1 for row in canonical if by_id.get(row.get("id")) != row)
+    differing += sum(1 for movie_id in by_id if movie_id not in canonical_ids)
+    detail = f"{differing} movies differ" if differing else "movie order differs"
+    return f"{DATASET_PATH} does not match {PARQUET_PATH} ({detail}); rerun python -m dataset_tools export"
+
+
+def run(args: argparse.Namespace) -> None:
+    if not args.dataset.exists():
+        raise SystemExit(f"Dataset not found at {args.dataset}")
+    movies = json.loads(args.dataset.read_text(encoding="utf-8"))
+    if not isinstance(movies, list):
+        raise SystemExit("Dataset is not a list.")
+
+    problems = validate_movies(movies, args.target)
+    if args.dataset.resolve() == DATASET_PATH.resolve():
+        mismatch = parquet_mismatch(movies)
+        if mismatch:
+            problems.append(mismatch)
+    for problem in problems:
+        print(problem)
+    if problems:
+        raise SystemExit(f"{len(problems)} problems found in {args.dataset}")
+    print(f"{args.dataset}: {len(movies)} movies OK")
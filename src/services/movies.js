@@ -85,3 +85,23 @@ export async function loadMovies() {
     };
   });
 }
+
+export async function loadKeywordNeighbours() {
+  try {
+    const res = await fetch("/movies_keyword_neighbours.json");
+    if (!res.ok) {
+      return new Map();
+    }
+    const data = await res.json();
+    const neighbours = data?.neighbours ?? {};
+    return new Map(
+      Object.entries(neighbours).map(([id, ids]) => [
+        String(id),
+        new Set(Array.isArray(ids) ? ids.map(String) : [])
+      ])
+    );
+  } catch (err) {
+    // The index only improves diversity; rounds can still be built without it.
+    return new Map();
+  }
+}
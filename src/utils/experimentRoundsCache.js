@@ -6,7 +6,7 @@ import {
   ROUNDS_COUNT
 } from "./experimentConfig";
 import {isFilteredByManualRules} from "./manualGenreFilterUtils";
-import {loadMovies} from "../services/movies";
+import {loadKeywordNeighbours, loadMovies} from "../services/movies";
 import urls from "./urls";
 
 function sanitizeMovie(movie) {
@@ -22,16 +22,17 @@ function shuffle(array) {
   return copy;
 }
 
-function getManualFilterKeys(label) {
-  if (typeof label !== "string") {
-    return [];
+function isTooSimilar(movieId, selectedIds, keywordNeighbours) {
+  const neighbours = keywordNeighbours.get(String(movieId));
+  if (!neighbours) {
+    return false;
   }
-  const trimmed = label.trim().toLowerCase();
-  if (!trimmed) {
-    return [];
+  for (const neighbourId of neighbours) {
+    if (selectedIds.has(neighbourId)) {
+      return true;
+    }
   }
-  const slug = trimmed.replace(/\s+/g, "-");
-  return slug === trimmed ? [trimmed] : [trimmed, slug];
+  return false;
 }
 
 function prepareMovieForSelection(movie, adjective, keywords) {
@@ -86,7 +87,10 @@ function preloadImages(urlsToPreload) {
 
 async function buildExperimentRounds() {
   const adjectivesPool = ADJECTIVES.length > 0 ? [...ADJECTIVES] : ["Recommended"];
-  const allMovies = await loadMovies();
+  const [allMovies, keywordNeighbours] = await Promise.all([
+    loadMovies(),
+    loadKeywordNeighbours()
+  ]);
 
   const moviesByCategory = CATEGORY_CONFIG.reduce((acc, category) => {
     const pool = allMovies.filter((movie) => {
@@ -118,6 +122,7 @@ async function buildExperimentRounds() {
     }
 
     const categories = [];
+    const roundMovieIds = new Set();
 
     for (const category of CATEGORY_CONFIG) {
       const queue = categoryQueues[category.id];
@@ -125,13 +130,21 @@ async function buildExperimentRounds() {
         throw new Error(`Missing movie pool for ${category.label}`);
       }
       const selection = [];
+      const deferred = [];
 
       while (
         selection.length < MOVIES_PER_CATEGORY &&
-        queue.cursor < queue.pool.length
+        (queue.cursor < queue.pool.length || deferred.length > 0)
       ) {
-        const baseMovie = queue.pool[queue.cursor];
-        queue.cursor += 1;
+        // Once the pool runs dry, relax the diversity rule rather than run
+        // out of movies.
+        const relaxDiversity = queue.cursor >= queue.pool.length;
+        const baseMovie = relaxDiversity
+          ? deferred.shift()
+          : queue.pool[queue.cursor];
+        if (!relaxDiversity) {
+          queue.cursor += 1;
+        }
 
         if (!baseMovie || !sanitizeMovie(baseMovie)) {
           continue;
@@ -150,16 +163,7 @@ async function buildExperimentRounds() {
           }
         }
 
-        const manualFilterKeys = getManualFilterKeys(category.label);
-        if (
-          isFilteredByManualRules(baseMovie, {
-            categoryId: category.id,
-            requiredGenreIds: category.requiredGenreId
-              ? [category.requiredGenreId]
-              : [],
-            extraKeys: manualFilterKeys
-          })
-        ) {
+        if (isFilteredByManualRules(baseMovie, {categoryId: category.id})) {
           continue;
         }
 
@@ -169,6 +173,13 @@ async function buildExperimentRounds() {
         if (condition.useAdjectives && keywords.length === 0) {
           continue;
         }
+        if (
+          !relaxDiversity &&
+          isTooSimilar(baseMovie.id, roundMovieIds, keywordNeighbours)
+        ) {
+          deferred.push(baseMovie);
+          continue;
+        }
 
         const adjective =
           adjectivesPool[adjectiveCursor % adjectivesPool.length];
@@ -182,7 +193,10 @@ async function buildExperimentRounds() {
 
         selection.push(enrichedMovie);
         globalUsedIds.add(baseMovie.id);
+        roundMovieIds.add(String(baseMovie.id));
       }
+      // Near-duplicates that were not needed here are tried first next round.
+      queue.pool.splice(queue.cursor, 0, ...deferred);
 
       if (selection.length < MOVIES_PER_CATEGORY) {
         throw new Error(`Not enough movies available for ${category.label}.`);
@@ -1,99 +1,75 @@
-import manualGenreFilters from "./manualGenreFilters.json";
+// Rules are compiled from manualGenreFilters.json by `python -m dataset_tools filters`.
+import compiledFilters from "./manualGenreFilters.compiled.json";
 
-function toIdSet(values) {
-    if (!Array.isArray(values)) {
-        return new Set();
-    }
-    const normalized = values
-        .map((value) => {
-            if (value === null || value === undefined) {
-                return null;
-            }
-            const trimmed = String(value).trim();
-            return trimmed.length > 0 ? trimmed : null;
-        })
-        .filter(Boolean);
-    return new Set(normalized);
-}
+const RESOLVED_IDS = new Set(compiledFilters?.resolvedIds ?? []);
 
-function toTitleSet(values) {
-    if (!Array.isArray(values)) {
-        return new Set();
+function toRuleSets(entry) {
+    if (!entry) {
+        return null;
     }
-    const normalized = values
-        .map((value) => {
-            if (value === null || value === undefined) {
-                return null;
-            }
-            const trimmed = String(value).trim().toLowerCase();
-            return trimmed.length > 0 ? trimmed : null;
-        })
-        .filter(Boolean);
-    return new Set(normalized);
+    return {
+        blockedIds: new Set(entry.blockedIds ?? []),
+        excludeIds: new Set(entry.excludeIds ?? []),
+        excludeTitles: new Set(entry.excludeTitles ?? []),
+        includeIds: new Set(entry.includeIds ?? []),
+        includeTitles: new Set(entry.includeTitles ?? [])
+    };
 }
 
-function mergeFilterConfigs(configs) {
-    const excludeIds = new Set();
-    const excludeTitles = new Set();
-    const includeIds = new Set();
-    const includeTitles = new Set();
-
-    configs.forEach((config) => {
-        const exclude = config?.exclude ?? {};
-        const include = config?.includeOnly ?? {};
-
-        toIdSet(exclude.ids).forEach((value) => excludeIds.add(value));
-        toTitleSet(exclude.titles).forEach((value) => excludeTitles.add(value));
-
-        toIdSet(include.ids).forEach((value) => includeIds.add(value));
-        toTitleSet(include.titles).forEach((value) => includeTitles.add(value));
+const COMPILED_RULES = new Map(
+    Object.entries(compiledFilters?.rules ?? {}).map(([key, entry]) => [
+        key,
+        toRuleSets(entry)
+    ])
+);
+
+function mergeRuleSets(ruleSets) {
+    const present = ruleSets.filter(Boolean);
+    if (present.length === 0) {
+        return null;
+    }
+    if (present.length === 1) {
+        return present[0];
+    }
+    const merged = toRuleSets({});
+    present.forEach((rules) => {
+        ["excludeIds", "excludeTitles", "includeIds", "includeTitles"].forEach((key) => {
+            rules[key].forEach((value) => merged[key].add(value));
+        });
     });
-
-    const hasRules =
-        excludeIds.size > 0 ||
-        excludeTitles.size > 0 ||
-        includeIds.size > 0 ||
-        includeTitles.size > 0;
-
-    return hasRules
-        ? {
-            excludeIds,
-            excludeTitles,
-            includeIds,
-            includeTitles
-        }
-        : null;
+    // Blocked ids were resolved per entry, not for this combination.
+    merged.blockedIds = null;
+    return merged;
 }
 
-function collectManualConfigs({categoryId, requiredGenreIds, extraKeys}) {
-    const configs = [];
-    const fallback = manualGenreFilters?.default;
-    if (fallback) {
-        configs.push(fallback);
-    }
+const genreRulesCache = new Map();
 
-    if (categoryId && manualGenreFilters?.[categoryId]) {
-        configs.push(manualGenreFilters[categoryId]);
+function resolveRules({categoryId, requiredGenreIds} = {}) {
+    if (categoryId && COMPILED_RULES.has(`category:${categoryId}`)) {
+        return COMPILED_RULES.get(`category:${categoryId}`);
     }
 
-    if (Array.isArray(requiredGenreIds)) {
-        requiredGenreIds.forEach((genreId) => {
-            const key = String(genreId);
-            if (manualGenreFilters?.[key]) {
-                configs.push(manualGenreFilters[key]);
-            }
-        });
+    const genreIds = Array.isArray(requiredGenreIds)
+        ? requiredGenreIds.map(String)
+        : [];
+    if (genreIds.length === 0) {
+        return COMPILED_RULES.get("default") ?? null;
     }
 
-    if (Array.isArray(extraKeys)) {
-        extraKeys.forEach((key) => {
-            if (manualGenreFilters?.[key]) {
-                configs.push(manualGenreFilters[key]);
-            }
-        });
+    const cacheKey = [...genreIds].sort().join(",");
+    if (!genreRulesCache.has(cacheKey)) {
+        genreRulesCache.set(
+            cacheKey,
+            mergeRuleSets(
+                genreIds.map((genreId) =>
+                    COMPILED_RULES.has(`genre:${genreId}`)
+                        ? COMPILED_RULES.get(`genre:${genreId}`)
+                        : COMPILED_RULES.get("default") ?? null
+                )
+            )
+        );
     }
-
-    return configs;
+    return genreRulesCache.get(cacheKey);
 }
 
 function resolveMovieTitle(movie) {
@@ -110,16 +86,19 @@ export function isFilteredByManualRules(movie, options = {}) {
     if (!movie) {
         return false;
     }
-    const configs = collectManualConfigs(options);
-    const filters = mergeFilterConfigs(configs);
-    if (!filters) {
+    const rules = resolveRules(options);
+    if (!rules) {
         return false;
     }
 
     const idStr = movie.id === 0 || movie.id ? String(movie.id).trim() : null;
-    const title = resolveMovieTitle(movie).trim().toLowerCase();
+    // Dataset movies were resolved when the rules were compiled.
+    if (rules.blockedIds && idStr && RESOLVED_IDS.has(idStr)) {
+        return rules.blockedIds.has(idStr);
+    }
 
-    const {excludeIds, excludeTitles, includeIds, includeTitles} = filters;
+    const title = resolveMovieTitle(movie).trim().toLowerCase();
+    const {excludeIds, excludeTitles, includeIds, includeTitles} = rules;
 
     if (includeIds.size > 0 || includeTitles.size > 0) {
         const matchesInclude =
@@ -138,9 +117,8 @@ export function isFilteredByManualRules(movie, options = {}) {
 }
 
 export function getManualRuleSummary(options = {}) {
-    const configs = collectManualConfigs(options);
-    const filters = mergeFilterConfigs(configs);
-    if (!filters) {
+    const rules = resolveRules(options);
+    if (!rules) {
         return {
             hasRules: false,
             includeIds: [],
@@ -150,7 +128,7 @@ export function getManualRuleSummary(options = {}) {
         };
     }
 
-    const {includeIds, includeTitles, excludeIds, excludeTitles} = filters;
+    const {includeIds, includeTitles, excludeIds, excludeTitles} = rules;
     return {
         hasRules: true,
         includeIds: Array.from(includeIds),